@@ -5,6 +5,7 @@ Wind Turbine Power Correction Application
 import os
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 from config import DIRECTORIES, PHYSICAL_CONSTANTS, WIND_SPEEDS, PROCESSING_CONFIG, FILE_PATTERNS, LOGGING_CONFIG
 
@@ -30,6 +31,7 @@ class WindTurbineProcessor:
         self.config = config or {}
         self.setup_directories()
         self.setup_constants()
+        self.setup_file_index()
         
     def setup_directories(self):
         """Setup required directories."""
@@ -48,6 +50,30 @@ class WindTurbineProcessor:
         self.processing_config = PROCESSING_CONFIG
         self.file_patterns = FILE_PATTERNS
         
+    def setup_file_index(self):
+        """Index the input and real data directories once (single scandir pass each)."""
+        self._input_files = self._list_files(self.directories['input'])
+        self._real_files = self._list_files(self.directories['real'])
+        
+        # {(station_name, year): filename} for files following the input pattern
+        pattern = re.escape(self.file_patterns['input_file_pattern'])
+        pattern = pattern.replace(re.escape('{station_name}'), r'(?P<station_name>.+)')
+        pattern = pattern.replace(re.escape('{year}'), r'(?P<year>\d{4})')
+        input_regex = re.compile(pattern)
+        
+        self._input_index = {}
+        for file in self._input_files:
+            match = input_regex.fullmatch(file)
+            if match:
+                self._input_index.setdefault((match['station_name'], match['year']), file)
+        
+    @staticmethod
+    def _list_files(dir_path):
+        """Return the names of regular files in a directory."""
+        # DirEntry.is_file() uses the readdir payload, no extra stat per file
+        with os.scandir(dir_path) as entries:
+            return [entry.name for entry in entries if entry.is_file()]
+        
     def load_turbine_data(self, index=None):
         """Load turbine configuration data."""
         index = index or self.processing_config['default_turbine_index']
@@ -55,7 +81,8 @@ class WindTurbineProcessor:
         try:
             wind_turbines_pattern = input.read_file(
                 self.directories['supply'], 
-                self.file_patterns['turbine_config_file']
+                self.file_patterns['turbine_config_file'],
+                dtype=input.TURBINE_CONFIG_DTYPES
             )
             
             turbine_name = wind_turbines_pattern.loc[index, 'Asset Name']
@@ -74,37 +101,36 @@ class WindTurbineProcessor:
             
     def find_input_file(self, station_name, year):
         """Find the input meteorological data file."""
-        expected_file = self.file_patterns['input_file_pattern'].format(
-            station_name=station_name, year=year
-        )
-        file_path = os.path.join(self.directories['input'], expected_file)
+        expected_file = self._input_index.get((station_name, year))
         
-        if os.path.exists(file_path):
+        if expected_file is not None:
             return expected_file
         else:
             # Fallback: search for files containing station name and year
-            file_list = [f for f in os.listdir(self.directories['input']) 
-                        if os.path.isfile(os.path.join(self.directories['input'], f))]
-            
-            for file in file_list:
+            for file in self._input_files:
                 if station_name in file and year in file:
                     return file
                     
             raise FileNotFoundError(f"No input file found for station {station_name} and year {year}")
             
     def find_real_data_file(self, turbine_name, year):
-        files = [f for f in os.listdir(self.directories["real"]) if year in f and turbine_name in f]
+        files = [f for f in self._real_files if year in f and turbine_name in f]
         if not files:
             raise FileNotFoundError(f"No real data file for {turbine_name}, {year}")
         return files[0]
         
     def process_meteorological_data(self, metdata):
-        """Process and prepare meteorological data."""
-        # Convert wind speed from km/h to m/s
-        metdata['Wind Spd (m/s)'] = metdata['Wind Spd (km/h)'] * self.processing_config['wind_speed_conversion']
+        """Process and prepare meteorological data (safe to call more than once)."""
+        # Convert wind speed from km/h to m/s (evaluated in the column's own dtype)
+        if 'Wind Spd (m/s)' not in metdata.columns:
+            metdata['Wind Spd (m/s)'] = metdata.eval(
+                "`Wind Spd (km/h)` * @conversion",
+                local_dict={'conversion': self.processing_config['wind_speed_conversion']}
+            )
         
         # Convert datetime
-        metdata['Date/Time (LST)'] = pd.to_datetime(metdata['Date/Time (LST)'])
+        if not pd.api.types.is_datetime64_any_dtype(metdata['Date/Time (LST)']):
+            metdata['Date/Time (LST)'] = pd.to_datetime(metdata['Date/Time (LST)'])
         
         return metdata
         
@@ -127,24 +153,24 @@ class WindTurbineProcessor:
             
             real_df = input.read_real_power_data(self.directories["real"], file_real)
             real_df['Volume'] *=1000 # MW → kW
-            real_df["time"] = pd.to_datetime(real_df["Date (MST)"])
-            real_df = real_df[["time", "Volume"]]
+            # Join key: int64 nanoseconds since epoch (integer hash join)
+            real_df["ts"] = pd.to_datetime(real_df["Date (MST)"]).astype("datetime64[ns]").astype("int64")
+            real_df = real_df[["ts", "Volume"]]
 
-            # ---------- merge met & power on timestamp
+            # Process meteorological data, then merge met & power on timestamp
             metdata = self.process_meteorological_data(metdata)
-            metdata = metdata.merge(
-            real_df, left_on="Date/Time (LST)", right_on="time", how="left")
-
+            metdata["ts"] = metdata["Date/Time (LST)"].astype("datetime64[ns]").astype("int64")
+            metdata = metdata.merge(real_df, on="ts", how="left").drop(columns="ts")
             
-            # Process meteorological data
-            metdata = self.process_meteorological_data(metdata)
+            # Site air density ρ_site  [kg m-3], computed once per turbine
+            metdata['rho'] = backward_calc.calculate_air_density(
+                metdata["Stn Press (kPa)"],      # kPa → Pa 
+                metdata["Temp (°C)"]             # air temperature in °C
+            )
             
             # Calculate roughness
-            metdata['Roughness'] = metdata.apply(
-                roughness.get_roughness, 
-                axis=1, 
-                wind_turbines_pattern=wind_turbines_pattern, 
-                turbine_name=turbine_name
+            metdata['Roughness'] = roughness.get_roughness_vec(
+                metdata, wind_turbines_pattern, turbine_name
             )
             
             # Calculate power output
@@ -158,47 +184,17 @@ class WindTurbineProcessor:
                 self.constants['ref_height'], power_curve, self.constants['losses'], metdata
             )
 
-            # Read sun times
-            sunrise_sunset_file = os.path.join(self.directories['supply'], self.file_patterns['sunrise_sunset_file'])
-            sun_times = input.read_sun_time(sunrise_sunset_file, year, turbine_name)            
-
-            # Apply blanket corrections
-            start_date = self.processing_config['blanket_start_date']
-            end_date = self.processing_config['blanket_end_date']
-            df_blanket = blanket.blanket_extract(sun_times, start_date, end_date, year)
-            df_power_out, df_blanket = blanket.stop_work_time(df_power_out, df_blanket)
-            
-            # Initialize blanket and smart columns
-            for speed in self.constants['wind_speeds']:
-                df_power_out[f'blanket_{speed}'] = df_power_out['power_out']
-                df_power_out[f'smart_{speed}'] = df_power_out['power_out']
-            
-            # Calculate speed results
-            speed_results = []
-            for _, row in df_power_out.iterrows():
-                result = blanket.datework_row(
-                    row, start_date, end_date, year, 
-                    self.constants['wind_speeds'], df_blanket
-                )
-                speed_results.append(result)
-            
-            speed_results_df = pd.DataFrame(speed_results)
-            
             # ───────── BACK-CALCULATE HUB-HEIGHT WIND SPEED ─────────
-            # Site air density ρ_site  [kg m-3]
-            air_density = backward_calc.calculate_air_density(
-                metdata["Stn Press (kPa)"],      # kPa → Pa 
-                metdata["Temp (°C)"]             # air temperature in °C
-            )
-
-            # Per-turbine real power  [kW]
-            per_turbine_kw = metdata["Volume"] / number_of_turbines
+            # Per-turbine real power  [kW], divided in place in one float32 buffer
+            per_turbine_kw = metdata["Volume"].to_numpy(dtype="float32", copy=True)
+            per_turbine_kw /= number_of_turbines
+            per_turbine_kw = pd.Series(per_turbine_kw, index=metdata.index, name="Volume")
 
             # Invert power curve → W_hub_backcalc  [m s-1]
             W_hub_backcalc = backward_calc.calc_wind_speed_from_power(
                 per_turbine_kw,
                 power_curve,
-                air_density,
+                metdata["rho"],
                 losses=0.0                        # we don't use losses
             )
 
@@ -213,25 +209,23 @@ class WindTurbineProcessor:
                 
             })
 
-            df_backcalc, df_blanket = blanket.stop_work_time(df_backcalc, df_blanket)
-            
-            # Initialize blanket and smart columns
-            for speed in self.constants['wind_speeds']:
-                df_backcalc[f'blanket_{speed}'] = df_backcalc['power_out']
-                df_backcalc[f'smart_{speed}'] = df_backcalc['power_out']
+            # Read sun times
+            sunrise_sunset_file = os.path.join(self.directories['supply'], self.file_patterns['sunrise_sunset_file'])
+            sun_times = input.read_sun_time(sunrise_sunset_file, year, turbine_name)            
 
-            # Calculate speed results
-            speed_results_b = []
-            for _, row in df_backcalc.iterrows():
-                result = blanket.datework_row(
-                    row, start_date, end_date, year, 
-                    self.constants['wind_speeds'], df_blanket
-                )
-                speed_results_b.append(result)
-            
-            speed_backcalc_df = pd.DataFrame(speed_results_b)
-            # Write the back-calc CSV
-            write_data.write_backcalc(
+            # Apply blanket corrections to both frames in one shared pass
+            # (adds the blanket and smart columns)
+            start_date = self.processing_config['blanket_start_date']
+            end_date = self.processing_config['blanket_end_date']
+            df_blanket = blanket.blanket_extract(sun_times, start_date, end_date, year)
+            (speed_results_df, speed_backcalc_df), df_blanket = blanket.datework_frames(
+                [df_power_out, df_backcalc], start_date, end_date, year,
+                self.constants['wind_speeds'], df_blanket
+            )
+
+            # Write the back-calc file in the background while the power
+            # file is written
+            backcalc_written = write_data.write_backcalc_async(
                 speed_backcalc_df,
                 self.directories["output"],
                 turbine_name,
@@ -239,7 +233,11 @@ class WindTurbineProcessor:
             )
            
             
-            write_data.write_power(speed_results_df, self.directories['output'], turbine_name, year)
+            try:
+                write_data.write_power(speed_results_df, self.directories['output'], turbine_name, year)
+            finally:
+                # Always wait for the back-calc write; a failure re-raises here
+                backcalc_written.result()
             
             logger.info(f"Successfully processed turbine {turbine_name}")
             return False  # Stop processing
@@ -269,10 +267,61 @@ class WindTurbineProcessor:
                 logger.info("Processing completed successfully")
             else:
                 logger.warning("Processing encountered issues but will continue")
+            
+            return continue_processing
                 
         except Exception as e:
             logger.error(f"Fatal error in processing: {e}")
             raise
+            
+    def run_batch(self, turbine_indices=None, year=None, max_workers=None):
+        """
+        Process several turbines in parallel worker processes.
+        
+        Turbines are independent (separate input and output files), so each
+        index is handed to its own WindTurbineProcessor in a worker process.
+        
+        Args:
+            turbine_indices: Row indices in the turbine config file (default: all)
+            year: Year to process
+            max_workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            List of turbine indices that failed or reported issues
+        """
+        year = year or self.processing_config['default_year']
+        
+        if turbine_indices is None:
+            wind_turbines_pattern = input.read_file(
+                self.directories['supply'], 
+                self.file_patterns['turbine_config_file']
+            )
+            turbine_indices = list(wind_turbines_pattern.index)
+        
+        logger.info(f"Starting batch processing of {len(turbine_indices)} turbines, Year: {year}")
+        
+        failed = []
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(_run_turbine, index, year, self.config): index
+                for index in turbine_indices
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    if future.result():
+                        failed.append(index)
+                except Exception as e:
+                    logger.error(f"Turbine index {index} failed: {e}")
+                    failed.append(index)
+        
+        logger.info(f"Batch processing finished: {len(turbine_indices) - len(failed)}/{len(turbine_indices)} turbines succeeded")
+        return sorted(failed)
+
+
+def _run_turbine(turbine_index, year, config):
+    """Process one turbine in a worker process (module level so it can be pickled)."""
+    return WindTurbineProcessor(config).run(turbine_index, year)
 
 
 def main():
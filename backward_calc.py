@@ -10,7 +10,6 @@ Dependencies
 ------------
 * numpy
 * pandas
-* scipy.interpolate
 * a `config.py` file exposing::
 
     PHYSICAL_CONSTANTS = {
@@ -21,9 +20,10 @@ Dependencies
 """
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 import pandas as pd
-from   scipy.interpolate import interp1d
 from   config           import PHYSICAL_CONSTANTS, WIND_SPEEDS
 import blanket 
 import logging
@@ -42,43 +42,46 @@ rho_std  = PHYSICAL_CONSTANTS['rho_std']
 
 def calculate_air_density(surface_pressure: float | pd.Series,
                            temperature: float | pd.Series) -> float | pd.Series:
-    try:
-        # Ensure temperature is not below absolute zero
-        if temperature <= -273.15:
-            logger.warning(f"Temperature {temperature}°C is below absolute zero, using -273.15°C")
-            temperature = -273.15
-        
-        # Convert temperature to Kelvin and calculate density
-        temperature_kelvin = temperature + 273.15
-        air_density = (surface_pressure * 1000) / (R * temperature_kelvin)
-        
-        return air_density
-        
-    except Exception as e:
-        logger.error(f"Error calculating air density: {e}")
-        return rho_std
-
-
-
-def _inverse_power_curve(power_curve: np.ndarray):
-    """Return an interpolator mapping *power* [kW] → *wind speed* [m s⁻¹]."""
-    wind, power = power_curve[:, 0], power_curve[:, 1]
-
-    # Remove duplicates so interp1d is strictly monotone in x (power)
+    """Vectorised site air density ρ = p / (R·T) [kg m⁻³].
+
+    *surface_pressure* is in kPa and *temperature* in °C; Series inputs return
+    a Series on the same index.  Temperatures at or below absolute zero are
+    clipped just above it.
+    """
+    below_zero = np.asarray(temperature) <= -273.15
+    if np.any(below_zero):
+        logger.warning(f"{int(np.sum(below_zero))} temperature value(s) below absolute zero, clipped to -273.14°C")
+
+    # Convert temperature to Kelvin and calculate density
+    temperature_kelvin = np.maximum(temperature, -273.14) + 273.15
+    return (surface_pressure * 1000) / (R * temperature_kelvin)
+
+
+
+@functools.lru_cache(maxsize=32)
+def _sorted_inverse_curve(wind_bytes: bytes, power_bytes: bytes, dtype: str):
+    """Cached worker for `_inverse_power_curve`, keyed by the raw curve bytes."""
+    wind = np.frombuffer(wind_bytes, dtype=dtype)
+    power = np.frombuffer(power_bytes, dtype=dtype)
+
+    # Remove duplicates so the curve is strictly monotone in x (power)
     uniq_power, idx = np.unique(power, return_index=True)
+    wind_sorted = wind[idx]
+
+    uniq_power.setflags(write=False)
+    wind_sorted.setflags(write=False)
+    return uniq_power, wind_sorted
+
 
-    return interp1d(
-        uniq_power,
-        wind[idx],
-        bounds_error=False,
-        fill_value=np.nan,
-        assume_sorted=True,
-    )
+def _inverse_power_curve(power_curve: tuple):
+    """Return sorted ``(power [kW], wind speed [m s⁻¹])`` arrays for `np.interp`."""
+    wind, power = (np.ascontiguousarray(a, dtype=np.float32) for a in power_curve)
+    return _sorted_inverse_curve(wind.tobytes(), power.tobytes(), wind.dtype.str)
 
 
 def calc_wind_speed_from_power(
     P_T_series: pd.Series,
-    power_curve: np.ndarray,
+    power_curve: tuple,
     air_density: pd.Series,
     losses: float = 0.0,
 ) -> pd.Series:
@@ -87,7 +90,7 @@ def calc_wind_speed_from_power(
     Parameters
     ----------
     P_T_series        : *pd.Series* – per‑turbine power [kW]
-    power_curve       : *np.ndarray* shape (N, 2) – [[wind(m/s), power(kW)]]
+    power_curve       : *tuple* – (wind(m/s), power(kW)) float32 arrays
     air_density       : *pd.Series* – site density [kg m⁻³]
     losses            : *float* – aggregate loss fraction (default **0.0**)
 
@@ -98,15 +101,22 @@ def calc_wind_speed_from_power(
     if not isinstance(P_T_series, pd.Series):
         raise TypeError("P_T_series must be a pandas Series")
 
-    inv_curve = _inverse_power_curve(power_curve)
+    uniq_power, wind_sorted = _inverse_power_curve(power_curve)
 
-    # Density correction term (ρ_std / ρ_site) ** 1/3
-    # Use standard air density (can be enhanced with pressure data)
-    air_density = rho_std
-    density_corr = (rho_std / air_density) ** (1 / 3)
+    # Density correction term (ρ_std / ρ_site) ** 1/3; hours without a
+    # site density fall back to standard air density
+    density_corr = (pd.Series(air_density, index=P_T_series.index)
+                    .fillna(rho_std)
+                    .to_numpy(dtype=float, copy=True))
+    np.divide(rho_std, density_corr, out=density_corr)
+    np.cbrt(density_corr, out=density_corr)
 
-    P_corr = P_T_series / (1 - losses) * density_corr
+    # P / (1 - losses) * correction: the scalar loss factor is folded into
+    # the multiplier so the power array is touched only once
+    density_corr *= 1.0 / (1 - losses)
+    P_corr = np.multiply(P_T_series.to_numpy(dtype=float), density_corr, out=density_corr)
 
-    # interp1d works on ndarray, so use .values and re‑wrap as Series
-    return pd.Series(inv_curve(P_corr.values), index=P_T_series.index, name="W_hub_backcalc")
+    # np.interp works on ndarray; re‑wrap the result as Series
+    W_hub = np.interp(P_corr, uniq_power, wind_sorted, left=np.nan, right=np.nan)
+    return pd.Series(W_hub, index=P_T_series.index, name="W_hub_backcalc")
 
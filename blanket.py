@@ -3,12 +3,23 @@ Blanket correction calculations for wind turbine power output.
 """
 
 from datetime import timedelta, datetime
+import numpy as np
 import pandas as pd
 import logging
 from config import PROCESSING_CONFIG
+from input import parse_time_of_day
 
 logger = logging.getLogger(__name__)
 
+NS_PER_DAY = 86_400 * 10**9
+
+
+def _as_datetime(col: pd.Series) -> pd.Series:
+    """Return *col* as datetimes, converting only when it is not datetime64 already."""
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    return pd.to_datetime(col)
+
 
 def blanket_extract(df: pd.DataFrame, start_date: str, end_date: str, year_now: int) -> pd.DataFrame:
     """
@@ -32,16 +43,18 @@ def blanket_extract(df: pd.DataFrame, start_date: str, end_date: str, year_now:
         start_datetime = pd.to_datetime(start_date_full, format='%Y-%m-%d')
         end_datetime = pd.to_datetime(end_date_full, format='%Y-%m-%d')
         
-        # Filter DataFrame for the date range
-        df_intime = df[(df['date'] >= start_datetime) & (df['date'] <= end_datetime)].copy()
+        # Filter DataFrame for the date range, keeping only the columns used
+        in_range = (df['date'] >= start_datetime) & (df['date'] <= end_datetime)
+        df_intime = df.loc[in_range, ['date', 'rise', 'set']]
         
         if df_intime.empty:
             logger.warning(f"No data found for date range {start_date} to {end_date} in year {year_now}")
             return df_intime
         
-        # Process sunrise and sunset times
-        df_intime.loc[:, 'rise'] = pd.to_datetime(df_intime['date'].astype(str) + ' ' + df_intime['rise'])
-        df_intime.loc[:, 'set'] = pd.to_datetime(df_intime['date'].astype(str) + ' ' + df_intime['set'])
+        # Process sunrise and sunset times (date + time of day; read_sun_time
+        # already stores them as Timedeltas)
+        df_intime['rise'] = df_intime['date'] + parse_time_of_day(df_intime['rise'])
+        df_intime['set'] = df_intime['date'] + parse_time_of_day(df_intime['set'])
         
         # Calculate work time boundaries (1 hour after rise, 1 hour before set)
         df_intime['1_hour_after_rise'] = df_intime['rise'] + timedelta(hours=1)
@@ -70,18 +83,17 @@ def stop_work_time(df_results: pd.DataFrame, df_blanket: pd.DataFrame) -> tuple:
     """
     try:
         # Ensure time column is datetime
-        df_results['time'] = pd.to_datetime(df_results['time'])
+        df_results['time'] = _as_datetime(df_results['time'])
         
-        # Format time column consistently
-        df_results['time'] = df_results['time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        df_results['time'] = pd.to_datetime(df_results['time'])
+        # Format time column consistently (whole seconds)
+        df_results['time'] = df_results['time'].dt.floor('s')
         
         # Ensure blanket datetime columns are properly formatted
-        df_blanket['1_hour_after_rise'] = pd.to_datetime(df_blanket['1_hour_after_rise'])
-        df_blanket['1_hour_before_set'] = pd.to_datetime(df_blanket['1_hour_before_set'])
+        df_blanket['1_hour_after_rise'] = _as_datetime(df_blanket['1_hour_after_rise'])
+        df_blanket['1_hour_before_set'] = _as_datetime(df_blanket['1_hour_before_set'])
         
-        # Convert date column to date format for comparison
-        df_blanket['date'] = pd.to_datetime(df_blanket['date']).dt.date
+        # Convert date column to midnight timestamps for comparison
+        df_blanket['date'] = _as_datetime(df_blanket['date']).dt.normalize()
         
         logger.info("Successfully processed work time data")
         return df_results, df_blanket
@@ -102,24 +114,19 @@ def win_speed_work(row: pd.Series, speed: list) -> pd.Series:
     Returns:
         Modified row with blanket and smart corrections applied
     """
-    try:
-        for speed_threshold in speed:
-            # Apply blanket correction (wind speed only)
-            if pd.notna(row['W_hub']) and float(row['W_hub']) <= speed_threshold:
-                row[f'blanket_{speed_threshold}'] = 0.0
-            
-            # Apply smart correction (wind speed + temperature + precipitation)
-            if (pd.notna(row['W_hub']) and 
-                float(row['W_hub']) <= speed_threshold and 
-                row['temp'] > 9.5 and 
-                row['precip'] < 1):
-                row[f'smart_{speed_threshold}'] = 0.0
+    for speed_threshold in speed:
+        # Apply blanket correction (wind speed only)
+        if pd.notna(row['W_hub']) and float(row['W_hub']) <= speed_threshold:
+            row[f'blanket_{speed_threshold}'] = 0.0
         
-        return row
-        
-    except Exception as e:
-        logger.error(f"Error applying wind speed work restrictions: {e}")
-        return row
+        # Apply smart correction (wind speed + temperature + precipitation)
+        if (pd.notna(row['W_hub']) and 
+            float(row['W_hub']) <= speed_threshold and 
+            row['temp'] > 9.5 and 
+            row['precip'] < 1):
+            row[f'smart_{speed_threshold}'] = 0.0
+    
+    return row
 
 def datework_row(row: pd.Series, start_date: str = PROCESSING_CONFIG['blanket_start_date'], end_date: str = PROCESSING_CONFIG['blanket_end_date'], 
                 year: int = 2024, speed: list = None, df_blanket: pd.DataFrame = None) -> pd.Series:
@@ -137,37 +144,186 @@ def datework_row(row: pd.Series, start_date: str = PROCESSING_CONFIG['blanket_st
     Returns:
         Modified row with date-based corrections applied
     """
+    if speed is None:
+        speed = []
+    if df_blanket is None:
+        return row
+    
+    # Create full dates with year
+    start_date_full = f"{year}-{start_date}"
+    end_date_full = f"{year}-{end_date}"
+    
+    # Convert to datetime objects
+    start_datetime = pd.to_datetime(start_date_full, format='%Y-%m-%d')
+    end_datetime = pd.to_datetime(end_date_full, format='%Y-%m-%d')
+    
+    # Check if row time is within the date range
+    if start_datetime <= row['time'] <= end_datetime:
+        # Get blanket data for this date (empty if the date is not covered)
+        blanket_rows = df_blanket[_as_datetime(df_blanket['date']) == row['time'].normalize()]
+        
+        if not blanket_rows.empty:
+            rise_time = blanket_rows['1_hour_after_rise'].iloc[0]
+            set_time = blanket_rows['1_hour_before_set'].iloc[0]
+            
+            # Apply corrections based on time of day
+            if row['time'] <= rise_time or row['time'] >= set_time:
+                row = win_speed_work(row, speed)
+    
+    return row
+
+
+def _datework_kernel(ts: np.ndarray, w_hub: np.ndarray, smart_weather: np.ndarray,
+                     rise_ts: np.ndarray, set_ts: np.ndarray, window: tuple,
+                     speeds: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Zero blanket/smart values in place on plain NumPy arrays.
+    
+    Args:
+        ts: Row timestamps as int64 nanoseconds
+        w_hub: Hub-height wind speed per row (NaN never triggers a correction)
+        smart_weather: Boolean mask of rows where the smart conditions hold
+        rise_ts: Per-row '1 hour after rise' as int64 (INT64_MIN if unknown)
+        set_ts: Per-row '1 hour before set' as int64 (INT64_MAX if unknown)
+        window: (start, end) of the blanket period as int64 nanoseconds
+        speeds: Wind speed thresholds
+        values: (n_rows, 2 * len(speeds)) array laid out blanket/smart per speed
+        
+    Returns:
+        The corrected values array
+    """
+    off_hours = (ts >= window[0]) & (ts <= window[1]) & ((ts <= rise_ts) | (ts >= set_ts))
+    
+    # (n_rows, n_speeds) masks from one broadcast compare over all thresholds
+    # Apply blanket correction (wind speed only)
+    blanket_mask = off_hours[:, None] & (w_hub[:, None] <= speeds[None, :])
+    values[:, 0::2][blanket_mask] = 0.0
+    
+    # Apply smart correction (wind speed + temperature + precipitation)
+    values[:, 1::2][blanket_mask & smart_weather[:, None]] = 0.0
+    
+    return values
+
+
+def datework_frame(df: pd.DataFrame, start_date: str = PROCESSING_CONFIG['blanket_start_date'], end_date: str = PROCESSING_CONFIG['blanket_end_date'],
+                   year: int = 2024, speed: list = None, df_blanket: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Apply date-based work restrictions to a whole DataFrame at once.
+    
+    Vectorized equivalent of calling datework_row on every row: the
+    blanket_{speed}/smart_{speed} block is preallocated as one 2-D array
+    seeded with power_out, _datework_kernel zeroes it with one mask per wind
+    speed threshold, and the array is attached to the frame without copying.
+    
+    Args:
+        df: DataFrame containing time, W_hub, temp, precip and power_out columns
+        start_date: Start date in format 'MM-DD'
+        end_date: End date in format 'MM-DD'
+        year: Year to process
+        speed: List of wind speed thresholds
+        df_blanket: DataFrame containing blanket correction data
+        
+    Returns:
+        DataFrame with corrected blanket_{speed}/smart_{speed} columns appended
+    """
     try:
         if speed is None:
             speed = []
-        if df_blanket is None:
-            return row
         
-        # Create full dates with year
-        start_date_full = f"{year}-{start_date}"
-        end_date_full = f"{year}-{end_date}"
+        # Preallocate the whole blanket/smart block, seeded with power_out
+        columns = [f'{kind}_{speed_threshold}' for speed_threshold in speed for kind in ('blanket', 'smart')]
+        values = np.empty((len(df), len(columns)))
+        values[:] = df['power_out'].to_numpy(dtype=float)[:, None]
         
-        # Convert to datetime objects
-        start_datetime = pd.to_datetime(start_date_full, format='%Y-%m-%d')
-        end_datetime = pd.to_datetime(end_date_full, format='%Y-%m-%d')
+        if df_blanket is not None:
+            _apply_blanket_window(df, start_date, end_date, year, speed, df_blanket, values)
         
-        # Check if row time is within the date range
-        if start_datetime <= row['time'] <= end_datetime:
-            # Check if the date exists in blanket data
-            if row['time'].date() in df_blanket['date'].values:
-                # Get blanket data for this date
-                blanket_rows = df_blanket[df_blanket['date'] == row['time'].date()]
-                
-                if not blanket_rows.empty:
-                    rise_time = blanket_rows['1_hour_after_rise'].iloc[0]
-                    set_time = blanket_rows['1_hour_before_set'].iloc[0]
-                    
-                    # Apply corrections based on time of day
-                    if row['time'] <= rise_time or row['time'] >= set_time:
-                        row = win_speed_work(row, speed)
+        speed_columns = pd.DataFrame(values, columns=columns, index=df.index, copy=False)
+        return pd.concat([df.drop(columns=columns, errors='ignore'), speed_columns], axis=1)
         
-        return row
+    except Exception as e:
+        logger.error(f"Error applying date-based work restrictions: {e}")
+        raise
+
+
+def datework_frames(frames: list, start_date: str = PROCESSING_CONFIG['blanket_start_date'], end_date: str = PROCESSING_CONFIG['blanket_end_date'],
+                    year: int = 2024, speed: list = None, df_blanket: pd.DataFrame = None) -> tuple:
+    """
+    Apply stop_work_time and datework_frame once to several frames sharing df_blanket.
+    
+    The frames are stacked into one tall DataFrame, processed in a single
+    pass and split back by row offset, each keeping its own columns.
+    
+    Args:
+        frames: DataFrames containing time, W_hub, temp, precip and power_out columns
+        start_date: Start date in format 'MM-DD'
+        end_date: End date in format 'MM-DD'
+        year: Year to process
+        speed: List of wind speed thresholds
+        df_blanket: DataFrame containing blanket correction data
+        
+    Returns:
+        Tuple of (list of corrected frames in input order, processed_blanket)
+    """
+    try:
+        if speed is None:
+            speed = []
+        speed_columns = [f'{kind}_{speed_threshold}' for speed_threshold in speed for kind in ('blanket', 'smart')]
+        
+        combined = pd.concat(frames, ignore_index=True)
+        combined, df_blanket = stop_work_time(combined, df_blanket)
+        combined = datework_frame(combined, start_date, end_date, year, speed, df_blanket)
+        
+        results = []
+        offset = 0
+        for frame in frames:
+            columns = [col for col in frame.columns if col not in speed_columns] + speed_columns
+            part = combined.iloc[offset:offset + len(frame)][columns]
+            part.index = frame.index
+            results.append(part)
+            offset += len(frame)
+        
+        return results, df_blanket
         
     except Exception as e:
         logger.error(f"Error applying date-based work restrictions: {e}")
-        return row
\ No newline at end of file
+        raise
+
+
+def _apply_blanket_window(df: pd.DataFrame, start_date: str, end_date: str, year: int,
+                          speed: list, df_blanket: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+    """Extract the kernel inputs from *df* and *df_blanket* and run _datework_kernel on *values*."""
+    # Create full dates with year
+    start_datetime = pd.to_datetime(f"{year}-{start_date}", format='%Y-%m-%d')
+    end_datetime = pd.to_datetime(f"{year}-{end_date}", format='%Y-%m-%d')
+    window = (start_datetime.value, end_datetime.value)
+    
+    ts = df['time'].to_numpy(dtype='datetime64[ns]').view('i8')
+    
+    # Look up sunrise/sunset boundaries for each row's date (first record per date)
+    # as a sorted join on integer day numbers
+    bounds = df_blanket[['1_hour_after_rise', '1_hour_before_set']].set_index(
+        _as_datetime(df_blanket['date'])
+    )
+    bounds = bounds[~bounds.index.duplicated(keep='first')].sort_index()
+    bound_days = bounds.index.to_numpy(dtype='datetime64[ns]').view('i8') // NS_PER_DAY
+    
+    rise_ts = np.full(len(ts), np.iinfo(np.int64).min)
+    set_ts = np.full(len(ts), np.iinfo(np.int64).max)
+    if len(bound_days):
+        days = ts // NS_PER_DAY
+        pos = np.minimum(np.searchsorted(bound_days, days), len(bound_days) - 1)
+        found = bound_days[pos] == days
+        rise_ts[found] = bounds['1_hour_after_rise'].to_numpy(dtype='datetime64[ns]').view('i8')[pos[found]]
+        set_ts[found] = bounds['1_hour_before_set'].to_numpy(dtype='datetime64[ns]').view('i8')[pos[found]]
+    
+    # NaT is INT64_MIN; push unknown sunsets to INT64_MAX so neither bound matches
+    set_ts[set_ts == np.iinfo(np.int64).min] = np.iinfo(np.int64).max
+    
+    w_hub = df['W_hub'].to_numpy(dtype=float)
+    smart_weather = ((df['temp'] > 9.5) & (df['precip'] < 1)).to_numpy()
+    
+    return _datework_kernel(
+        ts, w_hub, smart_weather, rise_ts, set_ts, window,
+        np.asarray(speed, dtype=float), values
+    )
@@ -2,6 +2,7 @@
 Data input and reading functions for wind turbine power correction application.
 """
 
+import functools
 import pandas as pd
 import os
 import numpy as np
@@ -10,14 +11,39 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Meteorological columns used downstream and their on-load dtypes
+METDATA_DTYPES = {
+    'Wind Spd (km/h)': 'float32',
+    'Temp (°C)': 'float32',
+    'Stn Press (kPa)': 'float32',
+    'Precip. Amount (mm)': 'float32',
+}
+METDATA_COLUMNS = ['Date/Time (LST)', *METDATA_DTYPES]
 
-def read_file(directory: str, filename: str) -> pd.DataFrame:
+# Real (SCADA) power data columns and their on-load dtypes
+REAL_POWER_DTYPES = {
+    'Volume': 'float32',
+}
+
+# Low-cardinality string columns of the turbine configuration file
+TURBINE_CONFIG_DTYPES = {
+    'Asset Name': 'category',
+    'Nearby_Station': 'category',
+    'Model': 'category',
+}
+
+
+def read_file(directory: str, filename: str, **read_csv_kwargs) -> pd.DataFrame:
     """
     Read a CSV file from the specified directory.
     
+    Files are parsed with the multi-threaded pyarrow engine unless an
+    ``engine`` is given explicitly.
+    
     Args:
         directory: Directory path containing the file
         filename: Name of the CSV file
+        **read_csv_kwargs: Extra keyword arguments passed to pandas.read_csv
         
     Returns:
         DataFrame containing the file data
@@ -27,8 +53,10 @@ def read_file(directory: str, filename: str) -> pd.DataFrame:
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
         
+    read_csv_kwargs.setdefault('engine', 'pyarrow')
+    
     try:
-        data = pd.read_csv(file_path)
+        data = pd.read_csv(file_path, **read_csv_kwargs)
         logger.info(f"Successfully read file: {file_path}")
         return data
     except Exception as e:
@@ -52,12 +80,19 @@ def read_data(wind_turbines: pd.DataFrame, power_curve_dir: str,
         file_to_work: Meteorological data filename
         
     Returns:
-        Tuple containing (hub_height, number_of_turbines, capacity, power_curve, metdata)
+        Tuple containing (hub_height, number_of_turbines, capacity, power_curve, metdata),
+        where power_curve is a (wind_speeds, powers) tuple of contiguous float32
+        arrays sorted by wind speed
     """
     try:
-        # Extract turbine configuration data
-        turbine_mask = wind_turbines['Asset Name'].str.contains(turbine_name, case=False, na=False)
-        turbine_rows = wind_turbines[turbine_mask]
+        # Extract turbine configuration data: exact (case-insensitive) name
+        # match first, substring search only as a fallback
+        # (.str on a category column only lowercases the distinct names)
+        asset_names = wind_turbines['Asset Name'].str.lower()
+        turbine_rows = wind_turbines[asset_names.to_numpy() == turbine_name.lower()]
+        if turbine_rows.empty:
+            turbine_mask = wind_turbines['Asset Name'].str.contains(turbine_name, case=False, na=False)
+            turbine_rows = wind_turbines[turbine_mask]
         
         if turbine_rows.empty:
             raise ValueError(f"Turbine '{turbine_name}' not found in configuration")
@@ -75,10 +110,28 @@ def read_data(wind_turbines: pd.DataFrame, power_curve_dir: str,
         if not power_curve_path.exists():
             raise FileNotFoundError(f"Power curve file not found: {power_curve_path}")
         
-        power_curve = np.array(pd.read_table(power_curve_path, header=0))
-        
-        # Load meteorological data
-        metdata = read_file(dir_input, file_to_work)
+        curve = pd.read_table(power_curve_path, header=0).to_numpy(dtype=float)
+        
+        # Sort by wind speed once so downstream interpolation can rely on it
+        if not np.all(np.diff(curve[:, 0]) >= 0):
+            logger.warning(f"Power curve {curve_name} is not sorted by wind speed, sorting")
+            curve = curve[np.argsort(curve[:, 0], kind='stable')]
+        
+        power_curve = (
+            np.ascontiguousarray(curve[:, 0], dtype=np.float32),
+            np.ascontiguousarray(curve[:, 1], dtype=np.float32),
+        )
+        
+        # Load meteorological data (only the columns used, narrow dtypes).
+        # The pyarrow engine converts to NumPy once here; the frame is kept
+        # NumPy-backed because every consumer downstream (np.interp, the
+        # blanket kernel, the power loop) works on NumPy buffers.
+        metdata = read_file(
+            dir_input, file_to_work,
+            usecols=METDATA_COLUMNS,
+            dtype=METDATA_DTYPES,
+            parse_dates=['Date/Time (LST)'],
+        )
         
         logger.info(f"Successfully loaded data for turbine {turbine_name}")
         return hub_height, number_of_turbines, capacity, power_curve, metdata
@@ -88,6 +141,58 @@ def read_data(wind_turbines: pd.DataFrame, power_curve_dir: str,
         raise
 
 
+def parse_time_of_day(times: pd.Series) -> pd.Series:
+    """
+    Convert clock times (e.g. '07:05', '7:05 AM') to Timedeltas since midnight.
+    
+    Only the distinct strings are parsed, then mapped back onto *times*;
+    a column that is already timedelta64 is returned unchanged.
+    
+    Args:
+        times: Series of clock-time strings or Timedeltas
+        
+    Returns:
+        Series of Timedeltas aligned with *times*
+    """
+    if pd.api.types.is_timedelta64_dtype(times):
+        return times
+    
+    unique_times = pd.Index(times.unique())
+    parsed = pd.to_datetime(unique_times, format='mixed')
+    offsets = parsed - parsed.normalize()
+    return pd.Series(offsets[unique_times.get_indexer(times)], index=times.index)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_sun_table(sunrise_sunset_file: str, year: str) -> pd.DataFrame:
+    """
+    Load the sunrise/sunset table for all turbines, with dates moved to *year*.
+    
+    The file is turbine-agnostic, so the parsed table is cached per
+    (file, year) and shared by every turbine processed in this process.
+    Callers must not modify the returned DataFrame.
+    """
+    # Load sunrise and sunset data (turbine names as category codes)
+    sun_times = pd.read_csv(sunrise_sunset_file, dtype={'turbine_name': 'category'})
+    
+    # Convert column names to strings
+    sun_times.columns = sun_times.columns.astype(str)
+    
+    # Process date column
+    sun_times['date'] = pd.to_datetime(sun_times['date'], format='%b %d %Y', errors='coerce')
+    sun_times['date'] = pd.to_datetime({
+        'year': int(year),
+        'month': sun_times['date'].dt.month,
+        'day': sun_times['date'].dt.day,
+    })
+    
+    # Sunrise/sunset clock times as Timedeltas since midnight
+    sun_times['rise'] = parse_time_of_day(sun_times['rise'])
+    sun_times['set'] = parse_time_of_day(sun_times['set'])
+    
+    return sun_times
+
+
 def read_sun_time(sunrise_sunset_file: str, year: str, turbine_name: str) -> pd.DataFrame:
     """
     Read and process sunrise/sunset data for a specific turbine and year.
@@ -98,20 +203,14 @@ def read_sun_time(sunrise_sunset_file: str, year: str, turbine_name: str) -> pd.
         turbine_name: Name of the turbine
         
     Returns:
-        DataFrame containing processed sunrise/sunset data
+        DataFrame containing processed sunrise/sunset data ('rise' and
+        'set' as Timedeltas since midnight)
     """
     try:
-        # Load sunrise and sunset data
-        sun_times = pd.read_csv(sunrise_sunset_file)
-        
-        # Convert column names to strings
-        sun_times.columns = sun_times.columns.astype(str)
-        
-        # Process date column
-        sun_times['date'] = pd.to_datetime(sun_times['date'], format='%b %d %Y', errors='coerce')
-        sun_times['date'] = sun_times['date'].apply(lambda x: x.replace(year=int(year)) if pd.notna(x) else x)
+        # Load sunrise and sunset data (parsed once per file and year)
+        sun_times = _read_sun_table(str(sunrise_sunset_file), str(year))
         
-        # Filter for specific turbine
+        # Filter for specific turbine (boolean indexing returns a copy)
         sun_times_turbine = sun_times[sun_times['turbine_name'] == turbine_name]
         
         if sun_times_turbine.empty:
@@ -126,4 +225,4 @@ def read_sun_time(sunrise_sunset_file: str, year: str, turbine_name: str) -> pd.
 
 def read_real_power_data(dirreal, file_name):
 
-    return pd.read_csv(os.path.join(dirreal, file_name))
+    return pd.read_csv(os.path.join(dirreal, file_name), dtype=REAL_POWER_DTYPES, engine='pyarrow')
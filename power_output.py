@@ -2,10 +2,11 @@
 Power output calculations for wind turbines.
 """
 
-import scipy.interpolate as interp
+import functools
 import pandas as pd
 import numpy as np
 from config import PHYSICAL_CONSTANTS
+import backward_calc
 import logging
 
 logger = logging.getLogger(__name__)
@@ -49,82 +50,90 @@ def wind_speed_at_hub_height(wind_speed: float, hub_height: float,
         return wind_speed
 
 
-def calculate_air_density(surface_pressure: float, temperature: float) -> float:
+def calculate_air_density(surface_pressure, temperature):
     """
     Calculate air density based on surface pressure and temperature.
     
+    Delegates to `backward_calc.calculate_air_density`, which accepts
+    scalars or Series and clips temperatures just above absolute zero.
+    
     Args:
-        surface_pressure: Surface pressure (Pa)
+        surface_pressure: Surface pressure (kPa)
         temperature: Temperature (°C)
         
     Returns:
         Air density (kg/m³)
     """
-    try:
-        # Ensure temperature is not below absolute zero
-        if temperature <= -273.15:
-            logger.warning(f"Temperature {temperature}°C is below absolute zero, using -273.15°C")
-            temperature = -273.15
-        
-        # Convert temperature to Kelvin and calculate density
-        temperature_kelvin = temperature + 273.15
-        air_density = (surface_pressure * 1000) / (R * temperature_kelvin)
-        
-        return air_density
+    return backward_calc.calculate_air_density(surface_pressure, temperature)
+
+
+@functools.lru_cache(maxsize=32)
+def _sorted_curve(wind_bytes: bytes, power_bytes: bytes, dtype: str) -> tuple:
+    """Cached worker for `sorted_power_curve`, keyed by the raw curve bytes."""
+    wind_speeds = np.frombuffer(wind_bytes, dtype=dtype).astype(float)
+    powers = np.frombuffer(power_bytes, dtype=dtype).astype(float)
+    
+    # Curves from read_data are already sorted; others are sorted here
+    if not np.all(np.diff(wind_speeds) >= 0):
+        order = np.argsort(wind_speeds, kind='stable')
+        wind_speeds, powers = wind_speeds[order], powers[order]
+    
+    wind_speeds.setflags(write=False)
+    powers.setflags(write=False)
+    return wind_speeds, powers
+
+
+def sorted_power_curve(power_curve: tuple) -> tuple:
+    """
+    Return the power curve as wind-speed-sorted float arrays for np.interp.
+    
+    The sorted arrays are built once per distinct curve and cached, so
+    repeated calls with the same curve do no work beyond hashing it.
+    
+    Args:
+        power_curve: Power curve as (wind speeds, powers) arrays
         
-    except Exception as e:
-        logger.error(f"Error calculating air density: {e}")
-        return rho_std
+    Returns:
+        Tuple of read-only (wind speeds, powers) float64 arrays
+    """
+    wind_speeds, powers = (np.ascontiguousarray(a, dtype=np.float32) for a in power_curve)
+    return _sorted_curve(wind_speeds.tobytes(), powers.tobytes(), wind_speeds.dtype.str)
 
 
 def power_output(W_hub: float, air_density: float, 
-                power_curve: np.ndarray, losses: float) -> tuple:
+                power_curve: tuple, losses: float) -> tuple:
     """
     Calculate power output using power curve and air density correction.
     
     Args:
         W_hub: Wind speed at hub height (m/s)
         air_density: Air density (kg/m³)
-        power_curve: Power curve data as numpy array (wind speed, power)
+        power_curve: Power curve as (wind speeds, powers) arrays
         losses: Power losses as fraction (0-1)
         
     Returns:
         Tuple of (power_output, adjustment_factor)
     """
-    try:
-        # Air density adjustment factor
-        adjustment_factor = (air_density / rho_std) ** (1.0 / 3)
-        
-        # Create interpolation function for power curve
-        if power_curve.shape[1] < 2:
-            logger.error("Power curve must have at least 2 columns (wind speed, power)")
-            return 0.0, adjustment_factor
-        
-        wind_speeds = power_curve[:, 0]
-        powers = power_curve[:, 1]
-        
-        # Create interpolation function
-        power_interp = interp.interp1d(
-            wind_speeds, powers, 
-            kind='linear', 
-            bounds_error=False, 
-            fill_value=0
-        )
-        
-        # Calculate power with density adjustment
-        adjusted_wind_speed = W_hub * adjustment_factor
-        power = power_interp(adjusted_wind_speed) * (1 - losses)
-        
-        return float(power), adjustment_factor
-        
-    except Exception as e:
-        logger.error(f"Error calculating power output: {e}")
-        return 0.0, 1.0
+    # Air density adjustment factor
+    adjustment_factor = (air_density / rho_std) ** (1.0 / 3)
+    
+    if len(power_curve) < 2:
+        logger.error("Power curve must have at least 2 columns (wind speed, power)")
+        return 0.0, adjustment_factor
+    
+    # Sorted curve arrays (cached per curve), zero outside the curve
+    wind_speeds, powers = sorted_power_curve(power_curve)
+    
+    # Calculate power with density adjustment
+    adjusted_wind_speed = W_hub * adjustment_factor
+    power = np.interp(adjusted_wind_speed, wind_speeds, powers, left=0.0, right=0.0) * (1 - losses)
+    
+    return float(power), adjustment_factor
 
 
 def get_power_output(temperature: pd.Series, wind_speed: pd.Series, 
                     hub_height: float, surface_roughness: pd.Series,
-                    ref_height: float, power_curve: np.ndarray, 
+                    ref_height: float, power_curve: tuple, 
                     losses: float, metdata: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate power output for all time periods.
@@ -135,7 +144,7 @@ def get_power_output(temperature: pd.Series, wind_speed: pd.Series,
         hub_height: Hub height of the turbine (m)
         surface_roughness: Surface roughness series (m)
         ref_height: Reference height for wind speed (m)
-        power_curve: Power curve data
+        power_curve: Power curve as (wind speeds, powers) arrays
         losses: Power losses as fraction
         metdata: Meteorological data DataFrame
         
@@ -143,50 +152,50 @@ def get_power_output(temperature: pd.Series, wind_speed: pd.Series,
         DataFrame containing power output results
     """
     try:
-        results = []
-        
-        for i in range(len(temperature)):
-            try:
-                # Calculate wind speed at hub height
-                W_hub = wind_speed_at_hub_height(
-                    wind_speed.iloc[i], hub_height, 
-                    surface_roughness.iloc[i], ref_height
-                )
-                
-                # Use standard air density (can be enhanced with pressure data)
-                air_density = rho_std
-                
-                # Calculate power output
-                power_out, adjustment_factor = power_output(
-                    W_hub, air_density, power_curve, losses
-                )
-                
-                # Store results
-                result = {
-                    'time': metdata['Date/Time (LST)'].iloc[i],
-                    'temp': temperature.iloc[i],
-                    'precip': metdata['Precip. Amount (mm)'].iloc[i],
-                    'WindSp': wind_speed.iloc[i],
-                    'W_hub': W_hub,
-                    'power_out': power_out
-                }
-                results.append(result)
-                
-            except Exception as e:
-                logger.warning(f"Error processing row {i}: {e}")
-                # Add row with zero power output
-                result = {
-                    'time': metdata['Date/Time (LST)'].iloc[i],
-                    'temp': temperature.iloc[i],
-                    'precip': metdata['Precip. Amount (mm)'].iloc[i],
-                    'WindSp': wind_speed.iloc[i],
-                    'W_hub': 0.0,
-                    'power_out': 0.0
-                }
-                results.append(result)
-        
-        # Create DataFrame from results
-        result_df = pd.DataFrame(results)
+        ws = wind_speed.to_numpy(dtype=float)
+        z0 = surface_roughness.to_numpy(dtype=float, copy=True)
+        
+        # Roughness guard: non-positive roughness falls back to 0.1 m
+        invalid = z0 <= 0
+        if invalid.any():
+            logger.warning(f"Invalid surface roughness in {int(invalid.sum())} rows, using default value")
+            z0[invalid] = 0.1
+        
+        # Logarithmic wind profile; hubs at or below z0 keep the measured speed
+        below_hub = hub_height <= z0
+        if below_hub.any():
+            logger.warning(f"Hub height ({hub_height}) must be greater than surface roughness in {int(below_hub.sum())} rows")
+        # Profile factor log(h/z0) / log(ref/z0) built in two reused buffers
+        with np.errstate(divide='ignore', invalid='ignore'):
+            W_hub = np.divide(hub_height, z0)
+            np.log(W_hub, out=W_hub)
+            log_ref = np.divide(ref_height, z0, out=z0)
+            np.log(log_ref, out=log_ref)
+            W_hub /= log_ref
+            W_hub *= ws
+        np.copyto(W_hub, ws, where=below_hub)
+        
+        # Use standard air density (can be enhanced with pressure data)
+        air_density = rho_std
+        adjustment_factor = (air_density / rho_std) ** (1.0 / 3)
+        
+        # One interpolation over the whole series, zero outside the curve
+        wind_speeds, powers = sorted_power_curve(power_curve)
+        power_out = np.interp(
+            W_hub * adjustment_factor, wind_speeds, powers, left=0.0, right=0.0
+        )
+        power_out *= (1 - losses)
+        
+        # Create DataFrame from result columns; W_hub and power_out are fresh
+        # buffers and the inputs are copied once, so no consolidation copy
+        result_df = pd.DataFrame({
+            'time': metdata['Date/Time (LST)'].to_numpy(copy=True),
+            'temp': temperature.to_numpy(copy=True),
+            'precip': metdata['Precip. Amount (mm)'].to_numpy(copy=True),
+            'WindSp': wind_speed.to_numpy(copy=True),
+            'W_hub': W_hub,
+            'power_out': power_out
+        }, copy=False)
         
         logger.info(f"Successfully calculated power output for {len(result_df)} time periods")
         return result_df
@@ -196,31 +205,32 @@ def get_power_output(temperature: pd.Series, wind_speed: pd.Series,
         raise
 
 
-def validate_power_curve(power_curve: np.ndarray) -> bool:
+def validate_power_curve(power_curve: tuple) -> bool:
     """
     Validate power curve data.
     
     Args:
-        power_curve: Power curve data as numpy array
+        power_curve: Power curve as (wind speeds, powers) arrays
         
     Returns:
         True if valid, False otherwise
     """
     try:
-        if power_curve is None or power_curve.size == 0:
+        if power_curve is None or len(power_curve) == 0 or np.size(power_curve[0]) == 0:
             logger.error("Power curve is empty or None")
             return False
         
-        if power_curve.shape[1] < 2:
+        if len(power_curve) < 2:
             logger.error("Power curve must have at least 2 columns (wind speed, power)")
             return False
         
+        wind_speeds, powers = power_curve
+        
         # Check for negative values
-        if np.any(power_curve < 0):
+        if np.any(wind_speeds < 0) or np.any(powers < 0):
             logger.warning("Power curve contains negative values")
         
         # Check for monotonic wind speeds
-        wind_speeds = power_curve[:, 0]
         if not np.all(np.diff(wind_speeds) >= 0):
             logger.warning("Wind speeds in power curve are not monotonically increasing")
         
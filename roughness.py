@@ -2,6 +2,7 @@
 Surface roughness calculations for wind turbine power correction.
 """
 
+import numpy as np
 import pandas as pd
 import logging
 
@@ -16,6 +17,12 @@ SEASON_MAPPING = {
     'Spring Mar-May': [3, 4, 5]
 }
 
+# Month number -> season column (index 0 is unused)
+MONTH_TO_SEASON_COL = [None] + [
+    next(season for season, months in SEASON_MAPPING.items() if month in months)
+    for month in range(1, 13)
+]
+
 
 def get_roughness(row: pd.Series, wind_turbines_pattern: pd.DataFrame, turbine_name: str) -> float:
     """
@@ -30,47 +37,90 @@ def get_roughness(row: pd.Series, wind_turbines_pattern: pd.DataFrame, turbine_n
     Returns:
         Roughness value for the given time period, or None if not found
     """
-    try:
-        # Extract month from datetime
-        month = row['Date/Time (LST)'].month
-        
-        # Find turbine data
-        if turbine_name not in wind_turbines_pattern['Asset Name'].values:
-            logger.warning(f"Turbine '{turbine_name}' not found in wind turbines data")
-            return None
-        
-        # Filter turbine data for the specific year
-        turbine_mask = (wind_turbines_pattern['Asset Name'] == turbine_name) 
-        
-        roughness_row = wind_turbines_pattern[turbine_mask]
+    # Extract month from datetime
+    month = row['Date/Time (LST)'].month
+    
+    # Find turbine data
+    if turbine_name not in wind_turbines_pattern['Asset Name'].values:
+        logger.warning(f"Turbine '{turbine_name}' not found in wind turbines data")
+        return None
+    
+    # Filter turbine data for the specific year
+    turbine_mask = (wind_turbines_pattern['Asset Name'] == turbine_name) 
+    
+    roughness_row = wind_turbines_pattern[turbine_mask]
+    
+    if roughness_row.empty:
+        logger.warning(f"No roughness data found for turbine '{turbine_name}'")
+        return None
+    
+    if len(roughness_row) > 1:
+        logger.warning(f"Multiple roughness records found for turbine '{turbine_name}' , using first")
+    
+    roughness_row = roughness_row.iloc[0]
+    
+    # Determine season based on month and return corresponding roughness value
+    season = MONTH_TO_SEASON_COL[month] if 1 <= month <= 12 else None
+    if season is None:
+        logger.warning(f"Unknown month {month} for roughness calculation")
+        return None
+    return roughness_row[season]
+
+
+def build_month_to_roughness(wind_turbines_pattern: pd.DataFrame, turbine_name: str) -> np.ndarray:
+    """
+    Build a month-indexed roughness lookup array for a turbine.
+    
+    Args:
+        wind_turbines_pattern: DataFrame containing turbine configuration and roughness values
+        turbine_name: Name of the turbine
         
-        if roughness_row.empty:
-            logger.warning(f"No roughness data found for turbine '{turbine_name}'")
-            return None
+    Returns:
+        Array of length 13 where index m holds the roughness for month m
+        (index 0, and every month if the turbine is not found, is NaN)
+    """
+    lookup = np.full(13, np.nan)
+    
+    turbine_rows = wind_turbines_pattern[wind_turbines_pattern['Asset Name'] == turbine_name]
+    
+    if turbine_rows.empty:
+        logger.warning(f"Turbine '{turbine_name}' not found in wind turbines data")
+        return lookup
+    
+    if len(turbine_rows) > 1:
+        logger.warning(f"Multiple roughness records found for turbine '{turbine_name}' , using first")
+    
+    roughness_row = turbine_rows.iloc[0]
+    lookup[1:] = roughness_row[MONTH_TO_SEASON_COL[1:]].to_numpy(dtype=float)
+    
+    return lookup
+
+
+def get_roughness_vec(metdata: pd.DataFrame, wind_turbines_pattern: pd.DataFrame, turbine_name: str) -> pd.Series:
+    """
+    Calculate surface roughness values for every row of the meteorological data.
+    
+    Vectorized equivalent of applying get_roughness row by row: the lookup from
+    build_month_to_roughness is fancy-indexed with the month of each timestamp.
+    
+    Args:
+        metdata: DataFrame containing the 'Date/Time (LST)' datetime column
+        wind_turbines_pattern: DataFrame containing turbine configuration and roughness values
+        turbine_name: Name of the turbine
         
-        if len(roughness_row) > 1:
-            logger.warning(f"Multiple roughness records found for turbine '{turbine_name}' , using first")
+    Returns:
+        Series of roughness values aligned with metdata (NaN where not found)
+    """
+    try:
+        month_to_z0 = build_month_to_roughness(wind_turbines_pattern, turbine_name)
         
-        roughness_row = roughness_row.iloc[0]
+        # Missing timestamps map to month 0 (NaN)
+        month = metdata['Date/Time (LST)'].dt.month.fillna(0).astype(int).to_numpy()
+        return pd.Series(month_to_z0[month], index=metdata.index, name='Roughness')
         
-        # Determine season based on month and return corresponding roughness value
-        if month in SEASON_MAPPING['Summer Jun-Jul']:
-            return roughness_row['Summer Jun-Jul']
-        elif month in SEASON_MAPPING['Pre-harvest Aug']:
-            return roughness_row['Pre-harvest Aug']
-        elif month in SEASON_MAPPING['Post-harvest/pre-snow Sep-Nov']:
-            return roughness_row['Post-harvest/pre-snow Sep-Nov']
-        elif month in SEASON_MAPPING['Snow covered Dec-Feb']:
-            return roughness_row['Snow covered Dec-Feb']
-        elif month in SEASON_MAPPING['Spring Mar-May']:
-            return roughness_row['Spring Mar-May']
-        else:
-            logger.warning(f"Unknown month {month} for roughness calculation")
-            return None
-            
     except Exception as e:
         logger.error(f"Error calculating roughness for turbine {turbine_name}: {e}")
-        return None
+        raise
 
 
 def get_season_name(month: int) -> str:
@@ -83,9 +133,8 @@ def get_season_name(month: int) -> str:
     Returns:
         Season name
     """
-    for season, months in SEASON_MAPPING.items():
-        if month in months:
-            return season
+    if 1 <= month <= 12:
+        return MONTH_TO_SEASON_COL[month]
     return "Unknown"
 
 
@@ -114,6 +114,134 @@ def test_directory_creation():
         return False
 
 
+def test_datework_frame():
+    """Test that vectorized blanket corrections match the row-wise version."""
+    try:
+        import pandas as pd
+        import blanket
+        
+        speeds = [5.0, 8.0]
+        df = pd.DataFrame({
+            'time': pd.date_range('2020-07-15', periods=72, freq='h'),
+            'temp': [12.0, 5.0, 15.0] * 24,
+            'precip': [0.0, 0.0, 2.0] * 24,
+            'W_hub': [4.0, 6.0, 9.0, float('nan')] * 18,
+            'power_out': 100.0,
+        })
+        for speed in speeds:
+            df[f'blanket_{speed}'] = df['power_out']
+            df[f'smart_{speed}'] = df['power_out']
+        
+        df_blanket = pd.DataFrame({
+            'date': pd.to_datetime(['2020-07-15', '2020-07-16']).date,
+            '1_hour_after_rise': pd.to_datetime(['2020-07-15 06:00', '2020-07-16 06:00']),
+            '1_hour_before_set': pd.to_datetime(['2020-07-15 20:00', '2020-07-16 20:00']),
+        })
+        
+        expected = pd.DataFrame([
+            blanket.datework_row(row.copy(), '07-15', '09-30', 2020, speeds, df_blanket)
+            for _, row in df.iterrows()
+        ])
+        result = blanket.datework_frame(df.copy(), '07-15', '09-30', 2020, speeds, df_blanket)
+        
+        for speed in speeds:
+            for column in (f'blanket_{speed}', f'smart_{speed}'):
+                if not (result[column].astype(float) == expected[column].astype(float)).all():
+                    logger.error(f"✗ Column '{column}' differs from row-wise result")
+                    return False
+        
+        logger.info("✓ Vectorized blanket corrections match row-wise results")
+        return True
+        
+    except Exception as e:
+        logger.error(f"✗ Blanket correction error: {e}")
+        return False
+
+
+def test_get_power_output():
+    """Test that vectorized power output matches the scalar helpers."""
+    try:
+        import numpy as np
+        import pandas as pd
+        import power_output
+        
+        power_curve = (np.array([0.0, 3.0, 10.0, 25.0], dtype='float32'),
+                       np.array([0.0, 0.0, 2000.0, 2000.0], dtype='float32'))
+        metdata = pd.DataFrame({
+            'Date/Time (LST)': pd.date_range('2020-01-01', periods=6, freq='h'),
+            'Temp (°C)': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            'Precip. Amount (mm)': [0.0] * 6,
+            'Wind Spd (m/s)': [2.0, 5.0, 8.0, 12.0, 30.0, float('nan')],
+            'Roughness': [0.03, 0.1, -1.0, 0.25, 0.03, 0.1],
+        })
+        
+        result = power_output.get_power_output(
+            metdata['Temp (°C)'], metdata['Wind Spd (m/s)'], 80.0, metdata['Roughness'],
+            10.0, power_curve, 0.1, metdata
+        )
+        
+        for i, row in metdata.iterrows():
+            W_hub = power_output.wind_speed_at_hub_height(row['Wind Spd (m/s)'], 80.0, row['Roughness'], 10.0)
+            expected, _ = power_output.power_output(W_hub, power_output.rho_std, power_curve, 0.1)
+            if not np.allclose([result['W_hub'][i], result['power_out'][i]], [W_hub, expected], equal_nan=True):
+                logger.error(f"✗ Row {i} differs from scalar power output")
+                return False
+        
+        logger.info("✓ Vectorized power output matches scalar results")
+        return True
+        
+    except Exception as e:
+        logger.error(f"✗ Power output error: {e}")
+        return False
+
+
+def test_backcalc_air_density():
+    """Test site air density and its use in the wind speed back-calculation."""
+    try:
+        import numpy as np
+        import pandas as pd
+        import backward_calc
+        
+        # Series density; temperatures at or below absolute zero are clipped
+        pressure = pd.Series([100.0, 90.0, 101.325], index=[10, 11, 12])
+        temperature = pd.Series([0.0, -300.0, 15.0], index=[10, 11, 12])
+        rho = backward_calc.calculate_air_density(pressure, temperature)
+        expected = pressure * 1000 / (backward_calc.R * (np.array([0.0, -273.14, 15.0]) + 273.15))
+        if not isinstance(rho, pd.Series) or not rho.index.equals(pressure.index) or not np.allclose(rho, expected):
+            logger.error("✗ Air density Series differs from p / (R·T)")
+            return False
+        
+        power_curve = (np.array([0.0, 3.0, 10.0, 25.0], dtype='float32'),
+                       np.array([0.0, 0.0, 2000.0, 2000.0], dtype='float32'))
+        power = pd.Series([500.0, 1000.0, 1500.0])
+        
+        def back_calc(density):
+            return backward_calc.calc_wind_speed_from_power(power, power_curve, pd.Series(density))
+        
+        W_std = back_calc([backward_calc.rho_std] * 3)
+        
+        # A non-standard site density changes W_hub by the (ρ_std/ρ)^(1/3) term
+        W_site = back_calc([1.0] * 3)
+        scaled_power = power * (backward_calc.rho_std / 1.0) ** (1 / 3)
+        expected_site = backward_calc.calc_wind_speed_from_power(
+            scaled_power, power_curve, pd.Series([backward_calc.rho_std] * 3))
+        if np.allclose(W_site, W_std) or not np.allclose(W_site, expected_site):
+            logger.error("✗ Site density not applied in back-calculation")
+            return False
+        
+        # Hours without a site density fall back to standard density
+        if not np.allclose(back_calc([np.nan] * 3), W_std):
+            logger.error("✗ NaN density does not reproduce the rho_std result")
+            return False
+        
+        logger.info("✓ Back-calculation uses the site air density")
+        return True
+        
+    except Exception as e:
+        logger.error(f"✗ Air density error: {e}")
+        return False
+
+
 def main():
     """Run all tests."""
     logger.info("Starting application tests...")
@@ -123,6 +251,9 @@ def main():
         ("Configuration Test", test_config),
         ("Processor Creation Test", test_processor_creation),
         ("Directory Creation Test", test_directory_creation),
+        ("Blanket Correction Test", test_datework_frame),
+        ("Power Output Test", test_get_power_output),
+        ("Back-calc Air Density Test", test_backcalc_air_density),
     ]
     
     passed = 0
@@ -1,7 +1,11 @@
 # Import required libraries for data analysis, numerical computations, and visualization
 import pandas as pd
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 import matplotlib
 from matplotlib import pyplot as plt
 
@@ -18,10 +22,43 @@ dirOld = "./result_before/"           # Previous model results for comparison
 stations_path = os.path.join(dir_base, 'Nearby_base.csv')
 years = range(2020, 2024)  # Analysis period: 2020-2023
 
+
+@functools.lru_cache(maxsize=None)
+def _load_turbine_meta(path):
+    """Turbine count per asset and the unique asset names, parsed once per path."""
+    wind_turbines = pd.read_csv(path, usecols=['Asset Name', 'number_of_turbines'], engine='pyarrow')
+    turbine_info = wind_turbines.set_index('Asset Name')['number_of_turbines'].to_dict()  # Convert to dictionary for fast lookup
+    return turbine_info, tuple(wind_turbines['Asset Name'].unique())
+
+
 # Load wind turbine metadata and create lookup dictionaries for efficient processing
-wind_turbines = pd.read_csv(stations_path)
-turbine_info = wind_turbines.set_index('Asset Name')['number_of_turbines'].to_dict()  # Convert to dictionary for fast lookup
-turbine_names = wind_turbines['Asset Name'].unique()  # Get unique turbine names
+turbine_info, turbine_names = _load_turbine_meta(stations_path)
+
+
+def _load_sum(path, col):
+    """Sum one column of a Parquet or CSV file.
+
+    CSV inputs are converted once to a single-column Parquet file next to the
+    source (``<name>.<col>.parquet``, rebuilt when the CSV is newer), so later
+    runs read only that column instead of re-parsing the text.
+    """
+    if not path.endswith('.parquet'):
+        cache_path = f"{os.path.splitext(path)[0]}.{col}.parquet"
+        if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(path):
+            pq.write_table(pv.read_csv(path, convert_options=pv.ConvertOptions(include_columns=[col])), cache_path)
+        path = cache_path
+    return np.nansum(pq.read_table(path, columns=[col]).column(0).to_numpy())
+
+
+def _load_total(path, col, scale):
+    """Scaled column sum of *path*."""
+    return _load_sum(path, col) * scale
+
+
+def _list_files(directory):
+    """Names of the files in *directory* (empty if it does not exist)."""
+    return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
 
 # Set up the figure with 4 subplots (one for each year)
 fig, axs = plt.subplots(2, 2, figsize=(16, 12))
@@ -30,66 +67,74 @@ fig, axs = plt.subplots(2, 2, figsize=(16, 12))
 mape_modeled, rmse_modeled = {}, {}
 mape_old, rmse_old = {}, {}
 
-# Process each year
-for i, year in enumerate(years):
-    annual_comparison = pd.DataFrame(index=turbine_names, columns=['Modeled', 'AESO', 'Initial'])
-
-    for turbine_name in turbine_names:
-        try:
+# Input file names, listed once (a missing file leaves its total NaN)
+modeled_files = _list_files(dirOut)
+real_files = _list_files(dirreal)
+old_files = _list_files(dirOld)
+
+# Annual totals per (year, turbine) (NaN where a file is missing)
+modeled_totals = np.full((len(years), len(turbine_names)), np.nan)
+aeso_totals = np.full((len(years), len(turbine_names)), np.nan)
+old_totals = np.full((len(years), len(turbine_names)), np.nan)
+
+# The reads are independent and I/O-bound, and pyarrow releases the GIL while
+# parsing, so they run concurrently in a thread pool
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    tasks = {}
+    for i, year in enumerate(years):
+        for j, turbine_name in enumerate(turbine_names):
             num_turbines = turbine_info.get(turbine_name, 1)  # Default to 1 if missing
 
-            # Load forecasted power data (Modeled)
-            power_file = os.path.join(dirOut, f"{turbine_name}_{year}_power_output_new.csv")
-            if os.path.exists(power_file):
-                power = pd.read_csv(power_file)
-                total_forecasted_power = (power['power_out'].sum() / 1000) * num_turbines  # Convert to MW & scale
-            else:
-                total_forecasted_power = np.nan
-
-            # Load real power data (AESO)
-            real_file = os.path.join(dirreal, f"{year}_{turbine_name}.csv")
-            if os.path.exists(real_file):
-                real_power_data = pd.read_csv(real_file)
-                total_real_power = real_power_data['Volume'].sum()  # Already in MW
-            else:
-                total_real_power = np.nan
-
-            # Load old power data (Initial)
-            old_file = os.path.join(dirOld, f"{turbine_name}_{year}_power_output_new.csv")
-            if os.path.exists(old_file):
-                old_power = pd.read_csv(old_file)
-                total_old_power = (old_power['power_out'].sum() / 1000) * num_turbines  # Convert to MW & scale
-            else:
-                total_old_power = np.nan
-
-            # Store data in DataFrame
-            annual_comparison.loc[turbine_name] = [total_forecasted_power, total_real_power, total_old_power]
-
+            # Forecasted power data (Modeled), converted to MW & scaled
+            power_file = f"{turbine_name}_{year}_power_output_new.parquet"
+            if power_file in modeled_files:
+                future = executor.submit(_load_total, os.path.join(dirOut, power_file), 'power_out', num_turbines / 1000)
+                tasks[future] = (modeled_totals, i, j)
+
+            # Real power data (AESO), already in MW
+            real_file = f"{year}_{turbine_name}.csv"
+            if real_file in real_files:
+                future = executor.submit(_load_total, os.path.join(dirreal, real_file), 'Volume', 1)
+                tasks[future] = (aeso_totals, i, j)
+
+            # Old power data (Initial), converted to MW & scaled
+            old_file = f"{turbine_name}_{year}_power_output_new.csv"
+            if old_file in old_files:
+                future = executor.submit(_load_total, os.path.join(dirOld, old_file), 'power_out', num_turbines / 1000)
+                tasks[future] = (old_totals, i, j)
+
+    failed = set()
+    for future, (totals, i, j) in tasks.items():
+        try:
+            totals[i, j] = future.result()
         except Exception as e:
-            print(f"Error processing {turbine_name} for year {year}: {e}")
-
-    # Drop rows where all values are NaN
-    annual_comparison.dropna(how="all", inplace=True)
+            if (i, j) not in failed:
+                print(f"Error processing {turbine_names[j]} for year {years[i]}: {e}")
+            failed.add((i, j))
 
-    # Calculate error metrics
-    valid_modeled_data = annual_comparison.dropna(subset=['Modeled', 'AESO'])
-    valid_old_data = annual_comparison.dropna(subset=['Initial', 'AESO'])
+# A failed read drops that turbine's row for the year
+for i, j in failed:
+    modeled_totals[i, j] = aeso_totals[i, j] = old_totals[i, j] = np.nan
 
-    if not valid_modeled_data.empty:
-        modeled = valid_modeled_data['Modeled'].values
-        actual = valid_modeled_data['AESO'].values
+# Process each year
+for i, year in enumerate(years):
+    # Calculate error metrics over turbines with both values available
+    valid_modeled = ~np.isnan(modeled_totals[i]) & ~np.isnan(aeso_totals[i])
+    valid_old = ~np.isnan(old_totals[i]) & ~np.isnan(aeso_totals[i])
 
+    if valid_modeled.any():
         # MAPE & RMSE for Modeled vs AESO
-        mape_modeled[year] = np.mean(np.abs((modeled - actual) / actual)) * 100
-        rmse_modeled[year] = np.sqrt(np.mean((modeled - actual) ** 2))
-
-    if not valid_old_data.empty:
-        old = valid_old_data['Initial'].values
-        actual = valid_old_data['AESO'].values
+        actual = aeso_totals[i][valid_modeled]
+        diff = modeled_totals[i][valid_modeled] - actual
+        mape_modeled[year] = np.mean(np.abs(diff / actual)) * 100
+        rmse_modeled[year] = np.sqrt(np.mean(diff * diff))
 
+    if valid_old.any():
         # MAPE & RMSE for Old vs AESO
-        mape_old[year] = np.mean(np.abs((old - actual) / actual)) * 100
-        rmse_old[year] = np.sqrt(np.mean((old - actual) ** 2))
+        actual = aeso_totals[i][valid_old]
+        diff = old_totals[i][valid_old] - actual
+        mape_old[year] = np.mean(np.abs(diff / actual)) * 100
+        rmse_old[year] = np.sqrt(np.mean(diff * diff))
 
 # Print the results
 for year in years:
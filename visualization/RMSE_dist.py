@@ -16,8 +16,7 @@ YEARS = range(2020, 2024)         # Analysis years: 2020-2023
 PERIOD_START, PERIOD_END = (7, 15), (9, 30)  # Analysis period: July 15 - September 30
 
 # Load metadata for distances
-meta = pd.read_csv(SUPPLY_DIR / 'Nearby_base.csv')
-meta = meta[['Asset Name', 'Distance']].dropna()
+meta = pd.read_csv(SUPPLY_DIR / 'Nearby_base.csv', usecols=['Asset Name', 'Distance'], engine='pyarrow').dropna()
 
 # Turbines to process
 TURBINES = meta['Asset Name'].unique()
@@ -28,7 +27,7 @@ results = []
 def read_series(path: Path, year: int):
     if not path.exists():
         return None
-    df = pd.read_csv(path, usecols=['time', 'W_hub'])
+    df = pd.read_parquet(path, columns=['time', 'W_hub'])
     df['time'] = pd.to_datetime(df['time'], errors='coerce')
     df = df.dropna(subset=['time', 'W_hub'])
 
@@ -41,8 +40,8 @@ for turb in TURBINES:
     all_mod, all_bck = [], []
 
     for yr in YEARS:
-        mod = read_series(MODEL_DIR / f'{turb}_{yr}_power_output_new.csv', yr)
-        bck = read_series(BACK_DIR / f'{turb}_{yr}_power_backcalc.csv', yr)
+        mod = read_series(MODEL_DIR / f'{turb}_{yr}_power_output_new.parquet', yr)
+        bck = read_series(BACK_DIR / f'{turb}_{yr}_power_backcalc.parquet', yr)
 
         if mod is None or bck is None:
             continue
@@ -1,8 +1,9 @@
 # Import required libraries for file operations, data analysis, statistical metrics, and visualization
+import functools
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from sklearn.metrics import mean_squared_error
+import pyarrow.parquet as pq
 import matplotlib
 from matplotlib import pyplot as plt
 import seaborn as sns
@@ -21,52 +22,74 @@ BIN_EDGES = np.arange(4, 13, 2)  # Wind speed bins: 4-5, 6-7, 8-9, 10-11, 12-13
 YEARS = range(2020, 2024)         # Analysis years: 2020-2023
 PERIOD_START, PERIOD_END = (7, 15), (9, 30)  # Analysis period: July 15 - September 30
 
-# Load metadata for distances
-meta = pd.read_csv(SUPPLY_DIR / 'Nearby_base.csv')
-meta = meta[['Asset Name', 'Distance']].dropna()
 
-# Turbines to process
-TURBINES = meta['Asset Name'].unique()
+@functools.lru_cache(maxsize=None)
+def _load_turbine_meta(path):
+    """Distance per asset and the unique asset names, parsed once per path."""
+    meta = pd.read_csv(path, usecols=['Asset Name', 'Distance'], engine='pyarrow')
+    meta = meta.dropna()
+    distances = meta.drop_duplicates('Asset Name').set_index('Asset Name')['Distance'].to_dict()
+    return distances, tuple(meta['Asset Name'].unique())
 
-# Store RMSE and distance
-results = []
+
+# Load metadata for distances and the turbines to process
+DISTANCES, TURBINES = _load_turbine_meta(str(SUPPLY_DIR / 'Nearby_base.csv'))
+
+# Store RMSE and distance per turbine (has_rmse marks turbines with data)
+rmse_arr = np.empty(len(TURBINES))
+dist_arr = np.array([DISTANCES[turb] for turb in TURBINES], dtype=float)
+has_rmse = np.zeros(len(TURBINES), dtype=bool)
 
 def read_series(path: Path, year: int):
+    return _read_series(str(path), year)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_series(path: str, year: int):
+    """Cached worker for read_series: the W_hub values (read-only array) in the period."""
+    path = Path(path)
     if not path.exists():
         return None
-    df = pd.read_csv(path, usecols=['time', 'W_hub'])
-    df['time'] = pd.to_datetime(df['time'], errors='coerce')
-    df = df.dropna(subset=['time', 'W_hub'])
 
-    # Filter by July 15 - Sep 30
+    # Filter by July 15 - Sep 30 while reading (null times never match)
     start = pd.Timestamp(year=year, month=PERIOD_START[0], day=PERIOD_START[1])
     end = pd.Timestamp(year=year, month=PERIOD_END[0], day=PERIOD_END[1], hour=23, minute=59, second=59)
-    return df[(df['time'] >= start) & (df['time'] <= end)]
+    table = pq.read_table(path, columns=['W_hub'], filters=[('time', '>=', start), ('time', '<=', end)])
+
+    w_hub = table.column('W_hub').to_numpy()
+    w_hub = w_hub[~np.isnan(w_hub)]
+    w_hub.setflags(write=False)
+    return w_hub
 
-# Calculate RMSE
-for turb in TURBINES:
-    all_mod, all_bck = [], []
+# Calculate RMSE over the bin densities of every year with both series
+n_bins = len(BIN_EDGES) - 1
+for k, turb in enumerate(TURBINES):
+    all_mod = np.empty((len(YEARS), n_bins))
+    all_bck = np.empty((len(YEARS), n_bins))
+    n_years = 0
 
     for yr in YEARS:
-        mod = read_series(MODEL_DIR / f'{turb}_{yr}_power_output_new.csv', yr)
-        bck = read_series(BACK_DIR / f'{turb}_{yr}_power_backcalc.csv', yr)
+        mod = read_series(MODEL_DIR / f'{turb}_{yr}_power_output_new.parquet', yr)
+        bck = read_series(BACK_DIR / f'{turb}_{yr}_power_backcalc.parquet', yr)
 
         if mod is None or bck is None:
             continue
 
-        mod_hist, _ = np.histogram(mod['W_hub'], bins=BIN_EDGES, density=True)
-        bck_hist, _ = np.histogram(bck['W_hub'], bins=BIN_EDGES, density=True)
-
-        all_mod.extend(mod_hist)
-        all_bck.extend(bck_hist)
+        all_mod[n_years] = np.histogram(mod, bins=BIN_EDGES, density=True)[0]
+        all_bck[n_years] = np.histogram(bck, bins=BIN_EDGES, density=True)[0]
+        n_years += 1
 
-    if all_mod and all_bck:
-        rmse = np.sqrt(mean_squared_error(all_mod, all_bck))
-        distance = meta.loc[meta['Asset Name'] == turb, 'Distance'].iloc[0]
-        results.append((turb, distance, rmse))
+    if n_years:
+        diff = all_mod[:n_years] - all_bck[:n_years]
+        rmse_arr[k] = np.sqrt(np.mean(diff * diff))
+        has_rmse[k] = True
 
 # Results DataFrame
-df_results = pd.DataFrame(results, columns=['Turbine', 'Distance_km', 'RMSE'])
+df_results = pd.DataFrame({
+    'Turbine': np.array(TURBINES, dtype=object)[has_rmse],
+    'Distance_km': dist_arr[has_rmse],
+    'RMSE': rmse_arr[has_rmse],
+})
 
 # Scatter Plot
 plt.figure(figsize=(6, 4))
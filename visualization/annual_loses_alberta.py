@@ -1,6 +1,9 @@
 # Import required libraries for data analysis and visualization
 import pandas as pd
+import numpy as np
 import os
+import glob
+import hashlib
 import matplotlib
 from matplotlib import pyplot as plt
 
@@ -12,15 +15,25 @@ matplotlib.use('Agg')
 dirOut = "./result/full_season/"     # Current: full season analysis
 dir_base = "./supply/"               # Base directory for supply data
 stations_path = os.path.join(dir_base, 'Nearby_base.csv')  # Path to wind turbine metadata
+cache_file = './cache/combined.parquet'  # Combined power/price data from the last run
+hash_file = './cache/combined.hash'      # Hash of the inputs cache_file was built from
 
 # Load wind turbine metadata and remove duplicate entries
-wind_turbines = pd.read_csv(stations_path).drop_duplicates(subset=['Asset Name'])
+wind_turbines = pd.read_csv(
+    stations_path, usecols=['Asset Name', 'number_of_turbines'], engine='pyarrow'
+).drop_duplicates(subset=['Asset Name'])
 # print("Unique turbines found in Nearby_base.csv:")
 # print(wind_turbines[['Asset Name', 'number_of_turbines']])
 
 # Define regulated cut-in speeds for wind turbine analysis (in m/s)
 cut_in_speeds = ['5.0', '5.5', '6.0', '6.5', '7.0', '7.5', '8.0']
 
+# Per-strategy cut-in columns and the power output columns used in the
+# analysis (the rest of each file is not read)
+blanket_columns = [f'blanket_{speed}' for speed in cut_in_speeds]
+smart_columns = [f'smart_{speed}' for speed in cut_in_speeds]
+power_columns = ['time', 'power_out'] + [col for pair in zip(blanket_columns, smart_columns) for col in pair]
+
 # Initialize summary data structure to store analysis results
 summary_data = {
     'Cut-in (m/s)': [],                           # Wind speed thresholds
@@ -36,109 +49,143 @@ summary_data = {
     'Time Spend Curtailed smart hr/yr': []         # Hours per year curtailed for smart strategy
 }
 
-# Initialize final DataFrame to store combined data
-combined_data = pd.DataFrame()
-
-# Fix hour 24 in the 'Date (HE)' column
-def fix_hour_24(date_str):
-    if isinstance(date_str, pd.Timestamp):  # If already a Timestamp, skip processing
-        return date_str
-    if pd.isnull(date_str):  # Handle NaN entries
-        return None
-    if "24" in date_str:  # Check for hour 24
-        fixed_date = pd.to_datetime(date_str.split(" ")[0], errors='coerce') + pd.Timedelta(days=1)
-        return fixed_date.strftime("%m/%d/%Y 00")
-    return date_str
-
-# Loop through each turbine
-for _, turbine_row in wind_turbines.iterrows():
-    turbine_name = turbine_row['Asset Name']
-    number_of_turbines = turbine_row['number_of_turbines']
-
+# Parse the 'Date (HE)' column, mapping hour 24 to 00 of the next day
+def parse_hour_ending(date_he):
+    date_he = date_he.astype(str)
+    hour_24 = date_he.str.contains(' 24', regex=False)
+    parsed = pd.to_datetime(date_he.where(~hour_24), format="%m/%d/%Y %H", errors='coerce')
+    next_day = pd.to_datetime(date_he.str.split(' ').str[0].where(hour_24), format="%m/%d/%Y", errors='coerce')
+    return parsed.where(~hour_24, next_day + pd.Timedelta(days=1))
+
+
+# Hash of this script's source (the join and scaling below), the analysed
+# columns and the name, size and mtime of every input file
+def inputs_hash():
+    paths = [stations_path,
+             *glob.glob(os.path.join(dirOut, '*_power_output_new.parquet')),
+             *glob.glob(os.path.join(dir_base, 'pool_price_*.csv'))]
+    with open(__file__, 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(repr(power_columns).encode())
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+# Reuse the combined data of the last run if none of its inputs changed
+combined_hash = inputs_hash()
+cached_hash = None
+if os.path.exists(cache_file) and os.path.exists(hash_file):
+    with open(hash_file) as f:
+        cached_hash = f.read()
+if cached_hash == combined_hash:
+    combined_data = pd.read_parquet(cache_file)
+    print(f"Loaded combined data from {cache_file}")
+else:
+    # Pool price per hour, loaded once per year and shared by all turbines
+    # (unparseable and repeated hours are dropped so every hour maps to one price)
+    price_maps = {}
     for year in range(2020, 2024):
-        # File paths
-        file_path = os.path.join(dirOut, f"{turbine_name}_{year}_power_output_new.csv")
-        print(file_path)
         pool_price_file = os.path.join(dir_base, f'pool_price_{year}.csv')
-
-        if not os.path.exists(file_path) or not os.path.exists(pool_price_file):
-            print(f"Missing files for {turbine_name} in {year}. Skipping...")
+        if not os.path.exists(pool_price_file):
             continue
-
-        # Load data
-        power = pd.read_csv(file_path)
-        pool_price = pd.read_csv(pool_price_file)
-
-        # Format datetime columns
-        power['time'] = pd.to_datetime(power['time'])
-        pool_price['Date (HE)'] = pool_price['Date (HE)'].astype(str).apply(fix_hour_24)
-        pool_price['Date (HE)'] = pd.to_datetime(pool_price['Date (HE)'], format="%m/%d/%Y %H", errors='coerce')
-
-        # Merge pool price with power data
-        power = pd.merge(
-            power,
-            pool_price[['Date (HE)', 'Price ($)']],
-            left_on='time',
-            right_on='Date (HE)',
-            how='left'
-        ).rename(columns={'Price ($)': 'pool_price'})
-
-        # Convert power_out, blanket, and smart columns to MWt and multiply by number of turbines
-        power['power_out'] = (power['power_out'] * number_of_turbines) / 1000
-
-        for speed in cut_in_speeds:
-            power[f'blanket_{speed}'] = (power[f'blanket_{speed}'] * number_of_turbines) / 1000
-            power[f'smart_{speed}'] = (power[f'smart_{speed}'] * number_of_turbines) / 1000
-
-        # Append to combined data
-        combined_data = pd.concat([combined_data, power], ignore_index=True)
-        # print(combined_data)
-
-        # Total power output
-        total_power = combined_data['power_out'].sum()
-        total_hours = len(combined_data)
-        x_values = [float(speed) for speed in cut_in_speeds]
-        # print(total_power)
-        # Perform combined calculations for all turbines in Alberta
-
-
+        pool_price = pd.read_csv(
+            pool_price_file, usecols=['Date (HE)', 'Price ($)'], dtype={'Date (HE)': str}, engine='pyarrow'
+        )
+        price_map = pool_price.set_index(parse_hour_ending(pool_price['Date (HE)']))['Price ($)']
+        price_maps[year] = price_map[price_map.index.notna() & ~price_map.index.duplicated()]
+
+    # Per-(turbine, year) power frames, combined once after the loop
+    frames = []
+
+    # Loop through each turbine
+    for turbine_name, number_of_turbines in zip(
+        wind_turbines['Asset Name'].to_numpy(), wind_turbines['number_of_turbines'].to_numpy()
+    ):
+
+        for year in range(2020, 2024):
+            # File paths
+            file_path = os.path.join(dirOut, f"{turbine_name}_{year}_power_output_new.parquet")
+            print(file_path)
+
+            if not os.path.exists(file_path) or year not in price_maps:
+                print(f"Missing files for {turbine_name} in {year}. Skipping...")
+                continue
+
+            # Load data
+            power = pd.read_parquet(file_path, columns=power_columns)
+
+            # Format datetime column and look up the pool price of each hour
+            power['time'] = pd.to_datetime(power['time'])
+            power['pool_price'] = power['time'].map(price_maps[year])
+
+            # Convert power_out, blanket, and smart columns to MWt and multiply by number of turbines
+            # (one 2-D block operation over all cut-in columns)
+            scaled_columns = ['power_out'] + power_columns[2:]
+            power[scaled_columns] = (power[scaled_columns].to_numpy() * number_of_turbines) / 1000
+
+            # Collect for the combined data
+            frames.append(power)
+
+    # Combine all turbines and years in a single concatenation
+    combined_data = pd.concat(frames, ignore_index=True, copy=False)
+
+    # Cache for the next run
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    combined_data.to_parquet(cache_file, compression='zstd', index=False)
+    with open(hash_file, 'w') as f:
+        f.write(combined_hash)
+# print(combined_data)
+
+# Total power output
+total_power = combined_data['power_out'].sum()
+total_hours = len(combined_data)
+x_values = [float(speed) for speed in cut_in_speeds]
+# print(total_power)
+# Perform combined calculations for all turbines in Alberta
+
+
+# Revenue of each time step (NaN prices count as zero, as in a pandas sum)
+power_out = combined_data['power_out'].to_numpy()
+revenue = combined_data['pool_price'].to_numpy() * power_out
+revenue[np.isnan(revenue)] = 0
+producing = power_out != 0
+
+
+# Curtailment metrics for every strategy and cut-in speed in one pass over
+# a single (rows x 14) block: blanket columns first, then smart
+strategy_columns = blanket_columns + smart_columns
+block = combined_data[strategy_columns].to_numpy()
+curtailed = (block == 0) & producing[:, None]
+
+metrics = pd.DataFrame({
+    'produced': np.nansum(block, axis=0),
+    'hours_curtailed': curtailed.sum(axis=0),
+    'money_lost': revenue @ curtailed,
+}, index=strategy_columns)
+
+# Calculate annual losses, production % and curtailed time per column
+metrics['annual_losses'] = total_power - metrics['produced']
+metrics['production_percent'] = (metrics['annual_losses'] / total_power) * 100
+metrics['curtailed_percent'] = metrics['hours_curtailed'] / total_hours * 100
+
+# Append to table (one row per cut-in speed)
 for speed in cut_in_speeds:
-    # Define blanket and smart column names for the current speed
-    blanket_col = f'blanket_{speed}'
-    smart_col = f'smart_{speed}'
-
-    # Filter curtailed periods
-    curtailed_blanket = combined_data[(combined_data[blanket_col] == 0) & (combined_data['power_out'] != 0)]
-    curtailed_smart = combined_data[(combined_data[smart_col] == 0) & (combined_data['power_out'] != 0)]
-    # print(combined_data[blanket_col].sum())
-    # Calculate annual losses and production %
-    annual_losses_b = total_power - combined_data[blanket_col].sum()
-    production_percent_b = (annual_losses_b / total_power) * 100
-    annual_losses_s = total_power - combined_data[smart_col].sum()
-    production_percent_s = (annual_losses_s / total_power) * 100
-
-    # Calculate curtailed time
-    hours_curtailed_b = curtailed_blanket.shape[0]
-    curtailed_percent_b = hours_curtailed_b / total_hours * 100
-    hours_curtailed_s = curtailed_smart.shape[0]
-    curtailed_percent_s = hours_curtailed_s / total_hours * 100
-
-    # Calculate money lost
-    money_lost_b = (curtailed_blanket['pool_price'] * curtailed_blanket['power_out']).sum()
-    money_lost_s = (curtailed_smart['pool_price'] * curtailed_smart['power_out']).sum()
-
-    # Append to table
+    blanket = metrics.loc[f'blanket_{speed}']
+    smart = metrics.loc[f'smart_{speed}']
+
     summary_data['Cut-in (m/s)'].append(float(speed))
-    summary_data['Production blanket, %'].append(production_percent_b)
-    summary_data['Production smart, %'].append(production_percent_s)
-    summary_data['Annual Losses blanket (MWh/yr)'].append(annual_losses_b)
-    summary_data['Annual Losses smart (MWh/yr)'].append(annual_losses_s)
-    summary_data['CAD/yr blanket (est.)'].append(money_lost_b)
-    summary_data['CAD/yr smart (est.)'].append(money_lost_s)
-    summary_data['Time Spend Curtailed blanket %'].append(curtailed_percent_b)
-    summary_data['Time Spend Curtailed smart %'].append(curtailed_percent_s)
-    summary_data['Time Spend Curtailed blanket hr/yr'].append(hours_curtailed_b)
-    summary_data['Time Spend Curtailed smart hr/yr'].append(hours_curtailed_s)
+    summary_data['Production blanket, %'].append(blanket['production_percent'])
+    summary_data['Production smart, %'].append(smart['production_percent'])
+    summary_data['Annual Losses blanket (MWh/yr)'].append(blanket['annual_losses'])
+    summary_data['Annual Losses smart (MWh/yr)'].append(smart['annual_losses'])
+    summary_data['CAD/yr blanket (est.)'].append(blanket['money_lost'])
+    summary_data['CAD/yr smart (est.)'].append(smart['money_lost'])
+    summary_data['Time Spend Curtailed blanket %'].append(blanket['curtailed_percent'])
+    summary_data['Time Spend Curtailed smart %'].append(smart['curtailed_percent'])
+    summary_data['Time Spend Curtailed blanket hr/yr'].append(int(blanket['hours_curtailed']))
+    summary_data['Time Spend Curtailed smart hr/yr'].append(int(smart['hours_curtailed']))
 
 # Create DataFrame for the table
 results_df = pd.DataFrame(summary_data)
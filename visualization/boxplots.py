@@ -13,11 +13,13 @@ Edit BASE_DIR if your project path differs.
 # ───────────────────────────────── 0. Imports & cosmetics ─────────
 # Import required libraries for data processing, visualization, and file operations
 import re, os
+from array import array
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib
+import matplotlib.patches
 from matplotlib import pyplot as plt
 
 matplotlib.use("Agg")                       # Use headless backend for server compatibility
@@ -46,6 +48,7 @@ FOLDERS = {
 }
 TITLES = {"peak_season": "Peak Season", "full_season": "Full Season"}    # Display titles for plots
 YEARS  = list(range(2020, 2024))                                        # Analysis years: 2020-2023
+DPI    = 300                                                            # PNG resolution (150 is ~3× faster for draft runs)
 
 # Create output directory for summary statistics tables
 STATS_OUT = BASE_DIR / "summary_tables"
@@ -53,50 +56,85 @@ STATS_OUT.mkdir(parents=True, exist_ok=True)
 
 # ──────────────────────────────── 2. Turbine meta (capacity) ──────
 # Load wind turbine metadata including names and total capacity in MW
-meta = pd.read_csv(SUPPLY_DIR / "Nearby_base.csv")[
-    ["Asset Name", "total_capacity_MW"]
-].drop_duplicates()
+meta = pd.read_csv(
+    SUPPLY_DIR / "Nearby_base.csv",
+    usecols=["Asset Name", "total_capacity_MW"],
+    engine="pyarrow",
+).drop_duplicates()
 
 # ──────────────────────────────── 3. Accumulators ─────────────────
+# One typed buffer per column (Season is implied by the scenario key)
+def new_columns() -> dict:
+    return {"Year": array("q"), "Turbine": [], "Cut": array("d"), "Type": [], "Value": array("d")}
+
+
+def append_row(cols: dict, year, turb, cut, typ, value):
+    cols["Year"].append(year)
+    cols["Turbine"].append(turb)
+    cols["Cut"].append(cut)
+    cols["Type"].append(typ)
+    cols["Value"].append(value)
+
+
+def columns_to_frame(cols: dict, season: str) -> pd.DataFrame:
+    """Build the long-format frame once, with categorical label columns."""
+    n = len(cols["Value"])
+    return pd.DataFrame({
+        "Season":  pd.Categorical([season] * n, categories=list(TITLES.values())),
+        "Year":    np.frombuffer(cols["Year"], dtype=np.int64),
+        "Turbine": pd.Categorical(cols["Turbine"]),
+        "Cut":     np.frombuffer(cols["Cut"], dtype=np.float64),
+        "Type":    pd.Categorical(cols["Type"], categories=["Blanket", "Smart"]),
+        "Value":   np.frombuffer(cols["Value"], dtype=np.float64),
+    })
+
+
 # Initialize data containers to store results for different metrics and seasons
 containers = {
-    "loss":        {"peak_season": [], "full_season": []},   # Energy losses in MWh/MW
-    "cost":        {"peak_season": [], "full_season": []},   # Financial losses in CAD/MW
-    "production":  {"peak_season": [], "full_season": []},   # Production percentages
+    "loss":        {"peak_season": new_columns(), "full_season": new_columns()},   # Energy losses in MWh/MW
+    "cost":        {"peak_season": new_columns(), "full_season": new_columns()},   # Financial losses in CAD/MW
+    "production":  {"peak_season": new_columns(), "full_season": new_columns()},   # Production percentages
 }
 
 # ──────────────────────────────── 4. Ingest loop  ─────────────────
+# Summary columns used below; only these are parsed from each file
+need = [
+    "Annual Losses blanket (MWh)",
+    "Annual Losses smart (MWh)",
+    "CAD/yr blanket",
+    "CAD/yr smart",
+    "Cut-in (m/s)",
+    "Production blanket %",
+    "Production smart %",
+]
+
+# filenames like: summary_<Turbine>_2020_back.csv  (optionally ..._back_1.csv)
+SUMMARY_RX = re.compile(r"summary_(.+)_(\d{4})_back(?:_\d+)?\.csv")
+
 for scen, folder in FOLDERS.items():
     if not folder.exists():
         print(f"⚠️  Folder missing: {folder}")
         continue
 
+    # Scan the folder once and index the summary files by (turbine, year)
+    summary_files = {}
+    for f in os.listdir(folder):
+        m = SUMMARY_RX.fullmatch(f)
+        if m:
+            summary_files.setdefault((m.group(1), int(m.group(2))), []).append(f)
+
     for year in YEARS:
-        for _, row in meta.iterrows():
-            turb, cap = row["Asset Name"], row["total_capacity_MW"]
+        for turb, cap in zip(meta["Asset Name"].to_numpy(), meta["total_capacity_MW"].to_numpy()):
             if pd.isna(cap) or cap == 0:
                 continue
 
-            # filenames like: summary_<Turbine>_2020_back.csv  (optionally ..._back_1.csv)
-            pat = rf"summary_{re.escape(turb)}_{year}_back(?:_\d+)?\.csv"
-            for f in os.listdir(folder):
-                if not re.fullmatch(pat, f):
-                    continue
+            for f in summary_files.get((turb, year), []):
                 try:
-                    df = pd.read_csv(folder / f)
+                    df = pd.read_csv(folder / f, usecols=lambda c: c in need)
                 except Exception as e:
                     print(f"Error {f}: {e}")
                     continue
 
-                need = [
-                    "Annual Losses blanket (MWh)",
-                    "Annual Losses smart (MWh)",
-                    "CAD/yr blanket",
-                    "CAD/yr smart",
-                    "Cut-in (m/s)",
-                    "Production blanket %",
-                    "Production smart %",
-                ]
                 if not set(need).issubset(df.columns):
                     continue
 
@@ -117,33 +155,21 @@ for scen, folder in FOLDERS.items():
                     sub = df_norm[df_norm["Cut-in (m/s)"] == cut].iloc[0]
 
                      # energy (MWh/MW)
-                    containers["loss"][scen].extend([
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Blanket", "Value": sub["Annual Losses blanket (MWh)"]},
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Smart",   "Value": sub["Annual Losses smart (MWh)"]},
-                    ])
+                    append_row(containers["loss"][scen], year, turb, cut, "Blanket", sub["Annual Losses blanket (MWh)"])
+                    append_row(containers["loss"][scen], year, turb, cut, "Smart",   sub["Annual Losses smart (MWh)"])
                     # cost (CAD/MW)
-                    containers["cost"][scen].extend([
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Blanket", "Value": sub["CAD/yr blanket"]},
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Smart",   "Value": sub["CAD/yr smart"]},
-                    ])
+                    append_row(containers["cost"][scen], year, turb, cut, "Blanket", sub["CAD/yr blanket"])
+                    append_row(containers["cost"][scen], year, turb, cut, "Smart",   sub["CAD/yr smart"])
                     # production (%)
-                    containers["production"][scen].extend([
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Blanket", "Value": sub["Production blanket %"]},
-                        {"Season": TITLES[scen], "Year": year, "Turbine": turb, "Cut": cut,
-                         "Type": "Smart",   "Value": sub["Production smart %"]},
-                    ])
+                    append_row(containers["production"][scen], year, turb, cut, "Blanket", sub["Production blanket %"])
+                    append_row(containers["production"][scen], year, turb, cut, "Smart",   sub["Production smart %"])
 
 
 
 # convert to DataFrames
 for metric in containers:
     for scen in containers[metric]:
-        containers[metric][scen] = pd.DataFrame(containers[metric][scen])
+        containers[metric][scen] = columns_to_frame(containers[metric][scen], TITLES[scen])
 
 # ──────────────────────────────── 5.  Outlier handling  ───────────
 def mark_outliers(df: pd.DataFrame) -> pd.DataFrame:
@@ -152,58 +178,88 @@ def mark_outliers(df: pd.DataFrame) -> pd.DataFrame:
        Season × Year × Cut × Type
     Returns the same frame with a Boolean column `IsOutlier`.
     """
-    def _flag(group):
-        q1, q3 = group.quantile([.25, .75])
-        iqr     = q3 - q1
-        low, hi = q1 - 1.5*iqr, q3 + 1.5*iqr
-        return (group < low) | (group > hi)
+    keys = ["Season", "Year", "Cut", "Type"]
 
+    # Q1/Q3 for every group in one pass, then fences broadcast back per row
+    q = df.groupby(keys, observed=True)["Value"].quantile([.25, .75]).unstack()
+    q.columns = ["Q1", "Q3"]
+    iqr     = q["Q3"] - q["Q1"]
+    low, hi = q["Q1"] - 1.5*iqr, q["Q3"] + 1.5*iqr
+
+    rows = pd.MultiIndex.from_frame(df[keys])
+    values = df["Value"].to_numpy()
     df = df.copy()
-    df["IsOutlier"] = (
-        df.groupby(["Season", "Year", "Cut", "Type"])["Value"]
-          .transform(_flag)
-    )
+    df["IsOutlier"] = (values < low.reindex(rows).to_numpy()) | (values > hi.reindex(rows).to_numpy())
     return df
 
 
 # ──────────────────────────────── 6.  Plot helper (dual y-lims) ───
-def make_boxplot(df_peak, df_full, ylabel, fname, ylim_full, ylim_peak):
+HUE_ORDER = ["Blanket", "Smart"]            # Box order within each cut-in group
+BOX_COLORS = [sns.desaturate(c, .75) for c in COLORS]   # seaborn's default box saturation
+
+def prepare(df_dict: dict) -> dict:
+    """
+    Groups every scenario frame once by Year × Cut × Type.
+    Returns {(year, scen, cut, type): ndarray of non-NaN values}.
+    """
+    groups = {}
+    for scen, df in df_dict.items():
+        if df.empty:
+            continue
+        for (year, cut, typ), vals in df.groupby(["Year", "Cut", "Type"], observed=True)["Value"]:
+            vals = vals.to_numpy()
+            groups[(year, scen, cut, typ)] = vals[~np.isnan(vals)]
+    return groups
+
+
+def _draw_boxes(ax, groups, year, scen):
+    """Dodged Blanket/Smart boxes per cut-in speed with matplotlib's native boxplot."""
+    cuts = sorted({cut for (y, s, cut, _) in groups if y == year and s == scen})
+    for offset, typ, color in zip((-0.2, 0.2), HUE_ORDER, BOX_COLORS):
+        data, positions = [], []
+        for i, cut in enumerate(cuts):
+            vals = groups.get((year, scen, cut, typ))
+            if vals is not None and vals.size:
+                data.append(vals)
+                positions.append(i + offset)
+        if not data:
+            continue
+        line = {"color": "#3f3f3f", "linewidth": 1.5}
+        ax.boxplot(data, positions=positions, widths=0.4, patch_artist=True,
+                   manage_ticks=False,
+                   boxprops={"facecolor": color, "edgecolor": "#3f3f3f", "linewidth": 1.5},
+                   whiskerprops=line, capprops=line,
+                   medianprops={"color": "black", "linewidth": 2},
+                   flierprops={"marker": "o", "markersize": 3,
+                               "markerfacecolor": "none", "markeredgecolor": "#3f3f3f"})
+    ax.set_xticks(range(len(cuts)), [str(cut) for cut in cuts])
+    ax.set_xlim(-0.5, len(cuts) - 0.5)
+
+
+def make_boxplot(groups, ylabel, fname, ylim_full, ylim_peak):
     """
     Builds an 8-panel figure (4 years × 2 seasons) with different y-axis
     limits for Full Season (top row) and Peak Season (bottom row).
-    *Plots always include* the outliers (dots).
+    *groups* is the output of `prepare`; *Plots always include* the outliers (dots).
     """
+    handles = [matplotlib.patches.Patch(facecolor=c, edgecolor="#3f3f3f", label=t)
+               for t, c in zip(HUE_ORDER, BOX_COLORS)]
     fig, axes = plt.subplots(2, 4, figsize=(20, 10), sharex=True)
-    for idx, year in enumerate(YEARS):
-        # -------- FULL season (row-0) --------
-        ax = axes[0, idx]
-        sns.boxplot(data=df_full[df_full["Year"] == year],
-                    x="Cut", y="Value", hue="Type",
-                    palette=COLORS, ax=ax,
-                    linewidth=1.5, fliersize=3,
-                    medianprops={"color": "black", "linewidth": 2})
-        ax.set_title(f"{TITLES['full_season']} – {year}")
-        ax.set_ylabel(ylabel if idx == 0 else "")
-        ax.set_ylim(ylim_full)        # full-season y-range
-        ax.grid(True, alpha=.35)
-        (ax.legend(loc="upper left") if idx == 0 else ax.get_legend().remove())
-
-        # -------- PEAK season (row-1) --------
-        ax = axes[1, idx]
-        sns.boxplot(data=df_peak[df_peak["Year"] == year],
-                    x="Cut", y="Value", hue="Type",
-                    palette=COLORS, ax=ax,
-                    linewidth=1.5, fliersize=3,
-                    medianprops={"color": "black", "linewidth": 2})
-        ax.set_title(f"{TITLES['peak_season']} – {year}")
-        ax.set_xlabel("Cut-in speed (m/s)")
-        ax.set_ylabel(ylabel if idx == 0 else "")
-        ax.set_ylim(ylim_peak)        # peak-season y-range
-        ax.grid(True, alpha=.35)
-        (ax.legend(loc="upper left") if idx == 0 else ax.get_legend().remove())
+    for row, (scen, ylim) in enumerate((("full_season", ylim_full), ("peak_season", ylim_peak))):
+        for idx, year in enumerate(YEARS):
+            # -------- FULL season (row-0), PEAK season (row-1) --------
+            ax = axes[row, idx]
+            _draw_boxes(ax, groups, year, scen)
+            ax.set_title(f"{TITLES[scen]} – {year}")
+            ax.set_xlabel("Cut-in speed (m/s)" if row == 1 else "")
+            ax.set_ylabel(ylabel if idx == 0 else "")
+            ax.set_ylim(ylim)
+            ax.grid(True, alpha=.35)
+            if idx == 0:
+                ax.legend(handles=handles, loc="upper left")
 
     plt.tight_layout()
-    plt.savefig(fname, dpi=300)
+    plt.savefig(fname, dpi=DPI, metadata={"Software": None})
     plt.close()
     print(f"📊  {fname}")
 
@@ -293,22 +349,19 @@ def export_production_losses_tables(df_full: pd.DataFrame, df_peak: pd.DataFrame
 
 # ──────────────────────────────── 9.  Build plots (dual y-lims) ───
 # Choose ranges you prefer for Full vs Peak rows:
-make_boxplot(containers["loss"]["peak_season"],
-             containers["loss"]["full_season"],
+make_boxplot(prepare(containers["loss"]),
              "Annual losses (MWh / installed MW)",
              BASE_DIR / "annual_losses_comparison_backward_1.png",
              ylim_full=(0, 140),   # Full Season (top row)
              ylim_peak=(0, 60))    # Peak Season (bottom row)
 
-make_boxplot(containers["cost"]["peak_season"],
-             containers["cost"]["full_season"],
+make_boxplot(prepare(containers["cost"]),
              "Annual cost (CAD / installed MW)",
              BASE_DIR / "cost_per_turbine_comparison_backward_1.png",
              ylim_full=(0, 25_000),
              ylim_peak=(0, 10_000))
 
-make_boxplot(containers["production"]["peak_season"],
-             containers["production"]["full_season"],
+make_boxplot(prepare(containers["production"]),
              "Production losses (%)",
              BASE_DIR / "production_comparison_backward_1.png",
              ylim_full=(0, 5),
@@ -21,10 +21,16 @@ CSV / PNG artefacts.
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import io
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Iterable, Sequence
 
+import numpy as np
 import pandas as pd
 import matplotlib
 from matplotlib import pyplot as plt
@@ -39,39 +45,48 @@ matplotlib.use("Agg")
 
 # ── helpers ─────────────────────────────────────────────────────────────────
 
-def fix_hour_24(date_str: str) -> str:
+def parse_hour_ending(date_he: pd.Series) -> pd.Series:
     """
-    Translate '… 24' to '00' of the next day (mm/dd/YYYY HH).
+    Parse 'mm/dd/YYYY HH' hour-ending stamps, translating '… 24' to 00 of the next day.
     
-    This function handles the special case where hour 24 appears in datetime strings,
-    converting it to hour 00 of the following day for proper datetime parsing.
+    Only the distinct dates (one per day) are parsed, strictly; the hour is
+    added to them as a whole-hour offset, so hour 24 rolls over to the next
+    day without special-casing. Missing stamps become NaT.
     """
-    if " 24" in date_str:
-        next_day = pd.to_datetime(date_str.split(" ")[0]) + pd.Timedelta(days=1)
-        return next_day.strftime("%m/%d/%Y 00")
-    return date_str
+    parts = date_he.astype(str).str.rpartition(" ")
+    codes, days = pd.factorize(parts[0])
+    hours = pd.to_numeric(parts[2].where(date_he.notna()))
+    if ((hours < 0) | (hours > 24)).any():
+        raise ValueError(f"hour-ending out of range 0-24 in {date_he.name!r}")
+    dates = pd.to_datetime(days, format="%m/%d/%Y")[codes]
+    return pd.Series(dates + pd.to_timedelta(hours, unit="h"), index=date_he.index)
+
+
+@functools.lru_cache(maxsize=None)
+def hourly_index(year: int) -> pd.DatetimeIndex:
+    """Every hour of *year*, built once per year (shared by all farms)."""
+    start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    return pd.date_range(start, end - pd.Timedelta(hours=1), freq="h")
 
 
 def load_pool(year: int, csv_path: str) -> pd.DataFrame:
     """Return a complete hourly price series for *year*; gaps → 0 CAD/MWh."""
-    pool = pd.read_csv(csv_path)
+    pool = pd.read_csv(csv_path, usecols=["Date (HE)", "Price ($)"],
+                       dtype={"Date (HE)": str}, engine="pyarrow")
 
-    pool["Date (HE)"] = (
-        pool["Date (HE)"]
-        .apply(fix_hour_24)
-        .pipe(pd.to_datetime, format="%m/%d/%Y %H")
-    )
+    pool["Date (HE)"] = parse_hour_ending(pool["Date (HE)"])
 
-    # collapse duplicated HE rows (mean() skips NaNs)
-    pool = pool.groupby("Date (HE)", as_index=False)["Price ($)"].mean()
+    # collapse duplicated HE rows (mean() skips NaNs); clean files skip the
+    # groupby, and the reindex below puts the hours in order either way
+    if pool["Date (HE)"].duplicated().any():
+        pool = pool.groupby("Date (HE)", sort=False, as_index=False)["Price ($)"].mean()
+    else:
+        pool = pool[["Date (HE)", "Price ($)"]]
 
     # pad to full calendar year
-    start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
-    full_index = pd.date_range(start, end - pd.Timedelta(hours=1), freq="h")
-
     pool = (
         pool.set_index("Date (HE)")
-            .reindex(full_index)
+            .reindex(hourly_index(year))
             .rename_axis("Date (HE)")
             .reset_index()
     )
@@ -84,48 +99,49 @@ def make_summary(power: pd.DataFrame,
                  cut_in_speeds: Sequence[str],
                  n_turbines: int) -> pd.DataFrame:
     """Build the per–cut‑in table and return it as a DataFrame."""
-    tbl = {
-        "Cut-in (m/s)": [],
-        "Production blanket %": [],
-        "Production smart %":   [],
-        "Annual Losses blanket (MWh)": [],
-        "Annual Losses smart (MWh)":   [],
-        "CAD/yr blanket": [],
-        "CAD/yr smart":   [],
-        "Time Curtailed blanket %": [],
-        "Time Curtailed smart %":   [],
-        "Time Curtailed blanket hr": [],
-        "Time Curtailed smart hr":   [],
-    }
-
-    # farm‑level power → MW
-    power = power.copy()
-    power["power_out"] = power["power_out"] * n_turbines / 1000
-    total_power = power["power_out"].sum()
+    # farm‑level power → MW; blanket/smart columns as float32 (rows × cut‑ins)
+    # blocks, left unscaled: curtailment (== 0) does not depend on the scale,
+    # and their column sums are accumulated in float64 and scaled afterwards
+    scale = n_turbines / 1000
+    pw = power["power_out"].to_numpy(dtype=float) * scale
+    B = power[[f"blanket_{spd}" for spd in cut_in_speeds]].to_numpy(dtype=np.float32)
+    S = power[[f"smart_{spd}" for spd in cut_in_speeds]].to_numpy(dtype=np.float32)
+    total_power = np.nansum(pw)
     total_hours = len(power)
 
-    for spd in cut_in_speeds:
-        b_col, s_col = f"blanket_{spd}", f"smart_{spd}"
-        power[b_col] = power[b_col] * n_turbines / 1000
-        power[s_col] = power[s_col] * n_turbines / 1000
-
-        curtailed_b = power[(power[b_col] == 0) & (power["power_out"] != 0)]
-        curtailed_s = power[(power[s_col] == 0) & (power["power_out"] != 0)]
-
-        losses_b = total_power - power[b_col].sum()
-        losses_s = total_power - power[s_col].sum()
-
-        tbl["Cut-in (m/s)"].append(float(spd))
-        tbl["Production blanket %"].append((losses_b / total_power) * 100)
-        tbl["Production smart %"].append((losses_s / total_power) * 100)
-        tbl["Annual Losses blanket (MWh)"].append(losses_b)
-        tbl["Annual Losses smart (MWh)"].append(losses_s)
-        tbl["CAD/yr blanket"].append((curtailed_b["pool_price"] * curtailed_b["power_out"]).sum())
-        tbl["CAD/yr smart"].append((curtailed_s["pool_price"] * curtailed_s["power_out"]).sum())
-        tbl["Time Curtailed blanket %"].append(len(curtailed_b) / total_hours * 100)
-        tbl["Time Curtailed smart %"].append(len(curtailed_s) / total_hours * 100)
-        tbl["Time Curtailed blanket hr"].append(len(curtailed_b))
-        tbl["Time Curtailed smart hr"].append(len(curtailed_s))
+    # revenue per hour (NaN treated as 0, as pandas sums skip NaNs)
+    revenue = power["pool_price"].to_numpy() * pw
+    revenue[np.isnan(revenue)] = 0
+
+    # curtailed = strategy output 0 while the unrestricted turbine produces
+    producing = (pw != 0)[:, None]
+    mask_b = (B == 0) & producing
+    mask_s = (S == 0) & producing
+
+    losses_b = total_power - np.nansum(B, axis=0, dtype=np.float64) * scale
+    losses_s = total_power - np.nansum(S, axis=0, dtype=np.float64) * scale
+
+    # curtailed revenue and hours per cut‑in in one float64 (2 × rows) @
+    # (rows × cut‑ins) product each; bool reductions down the short axis of
+    # the mask are several times slower than the matmul
+    weights = np.vstack([revenue, np.ones_like(revenue)])
+    cad_b, hours_b = weights @ mask_b
+    cad_s, hours_s = weights @ mask_s
+    hours_b, hours_s = hours_b.astype(np.int64), hours_s.astype(np.int64)
+
+    tbl = {
+        "Cut-in (m/s)": [float(spd) for spd in cut_in_speeds],
+        "Production blanket %": (losses_b / total_power) * 100,
+        "Production smart %":   (losses_s / total_power) * 100,
+        "Annual Losses blanket (MWh)": losses_b,
+        "Annual Losses smart (MWh)":   losses_s,
+        "CAD/yr blanket": cad_b,
+        "CAD/yr smart":   cad_s,
+        "Time Curtailed blanket %": hours_b / total_hours * 100,
+        "Time Curtailed smart %":   hours_s / total_hours * 100,
+        "Time Curtailed blanket hr": hours_b,
+        "Time Curtailed smart hr":   hours_s,
+    }
 
     return pd.DataFrame(tbl).round({
         "Cut-in (m/s)": 1,
@@ -142,6 +158,12 @@ def make_summary(power: pd.DataFrame,
     })
 
 
+@functools.lru_cache(maxsize=None)
+def summary_figure() -> plt.Figure:
+    """The figure `plot_summary` draws on, created once per process."""
+    return plt.figure(figsize=(9, 5))
+
+
 def plot_summary(df: pd.DataFrame,
                  asset: str,
                  year: int,
@@ -150,7 +172,10 @@ def plot_summary(df: pd.DataFrame,
     """Create the dual‑axis production vs. curtailed‑hours figure."""
     x_vals = [float(s) for s in cut_in_speeds]
 
-    fig, ax1 = plt.subplots(figsize=(9, 5))
+    # reuse the process' figure; clf() also drops the twin axis and legend
+    fig = summary_figure()
+    fig.clf()
+    ax1 = fig.add_subplot()
     ax1.plot(x_vals, df["Production blanket %"], "o-b",
              label="Production Blanket (%)")
     ax1.plot(x_vals, df["Production smart %"],   "o-r",
@@ -173,7 +198,6 @@ def plot_summary(df: pd.DataFrame,
     if out_path is not None:
         fig.savefig(out_path, dpi=150)
         print(f"🖼  figure saved → {out_path}")
-    plt.close(fig)
 
 
 # ── user paths & constants ─────────────────────────────────────────────────
@@ -182,69 +206,104 @@ DIR_BASE  = "./supply/"
 STATIONS  = os.path.join(DIR_BASE, "Nearby_base.csv")
 YEARS     = range(2020, 2024)                    # inclusive
 CUTS      = ["5.0", "5.5", "6.0", "6.5", "7.0", "7.5", "8.0"]
+POWER_COLS = ["time", "power_out"] + [f"{strategy}_{spd}" for spd in CUTS
+                                      for strategy in ("blanket", "smart")]
 
-# ── asset list ─────────────────────────────────────────────────────────────
+# ── per‑(asset, year) job ──────────────────────────────────────────────────
 
-assets: Iterable[str] = (
-    pd.read_csv(STATIONS)["Asset Name"].unique().tolist()
-)
+def process_year(asset: str, yr: int, n_turbines: int) -> pd.DataFrame | None:
+    """Price‑join, summarise and write the outputs of one farm and year."""
+    power_path = os.path.join(DIR_OUT, f"{asset}_{yr}_power_backcalc_3.parquet")
+    price_path = os.path.join(DIR_BASE, f"pool_price_{yr}.csv")
 
+    if not (os.path.exists(power_path) and os.path.exists(price_path)):
+        print(f"⚠️  missing files for {asset} / {yr} – skipped")
+        return None
 
-print("Assets found:")
-for a in assets:
-    print(f" • {a}")
-print()
+    print(f"\n▶︎ {yr} …")
 
-# ── main loop ───────────────────────────────────────────────────────────────
-for asset in assets:
-    n_turbines = (
-        pd.read_csv(STATIONS)
-          .loc[lambda d: d["Asset Name"].str.contains(asset, case=False),
-               "number_of_turbines"]
-          .iloc[0]
-    )
-    print(f"\n================ {asset}  –  {n_turbines} turbines ================")
+    power_df = pd.read_parquet(power_path, columns=POWER_COLS)
+    pool_df  = load_pool(yr, price_path)
+
+    print(f"  • power rows: {len(power_df):5d}")
+    print(f"  • pool  rows: {len(pool_df):5d}")
+
+    # hourly price lookup (pool hours are unique after load_pool)
+    price = pool_df.set_index("Date (HE)")["Price ($)"]
+    power = power_df.assign(pool_price=power_df["time"].map(price).fillna(0))
 
-    for yr in YEARS:
-        power_path = os.path.join(DIR_OUT, f"{asset}_{yr}_power_backcalc_3.csv")
-        price_path = os.path.join(DIR_BASE, f"pool_price_{yr}.csv")
+    zero_price_hrs = power.loc[power["pool_price"] == 0, "time"]
+    if not zero_price_hrs.empty:
+        print("\n⚠️  hours with zero price:")
+        print(zero_price_hrs.dt.strftime("%Y-%m-%d %H:%M").head(10).to_list(), "…")
+    else:
+        print("✓ no zero‑price hours")
 
-        if not (os.path.exists(power_path) and os.path.exists(price_path)):
-            print(f"⚠️  missing files for {asset} / {yr} – skipped")
-            continue
+    print(f"  • merged rows: {len(power):5d}  (zero prices: {(power['pool_price'] == 0).sum():,})\n")
 
-        print(f"\n▶︎ {yr} …")
+    summary = make_summary(power, CUTS, n_turbines)
+    print(summary, "\n")
 
-        power_df = pd.read_csv(power_path, parse_dates=["time"])
-        pool_df  = load_pool(yr, price_path)
+    if SAVE_TABLE:
+        csv_out = f"summary_{asset}_{yr}_back_3.csv"
+        summary.to_csv(csv_out, index=False)
+        print(f"📄 table saved → {csv_out}")
 
-        print(f"  • power rows: {len(power_df):5d}")
-        print(f"  • pool  rows: {len(pool_df):5d}")
+    if SAVE_PLOT:
+        png_out = f"losses_vs_hours_{asset}_{yr}_back_3.png"
+        plot_summary(summary, asset, yr, CUTS, png_out)
 
-        power = (
-            power_df.merge(pool_df, left_on="time", right_on="Date (HE)", how="left")
-                    .rename(columns={"Price ($)": "pool_price"})
-                    .fillna({"pool_price": 0})
-                    .drop(columns=["Date (HE)"])
-        )
+    return summary
+
+
+def process_one(asset: str, yr: int, n_turbines: int) -> str:
+    """
+    Worker entry point: run `process_year` and return the console output it
+    produced, so the parent can print the logs of parallel jobs in order.
+
+    A failing farm‑year does not abort the run: its traceback is appended
+    to its log and the other jobs carry on.
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            process_year(asset, yr, n_turbines)
+        except Exception:
+            print(f"❌ {asset} / {yr} failed:")
+            print(traceback.format_exc(), end="")
+    return log.getvalue()
+
+
+if __name__ == "__main__":
+    # ── asset list ─────────────────────────────────────────────────────────
+
+    stations = pd.read_csv(STATIONS, usecols=["Asset Name", "number_of_turbines"], engine="pyarrow")
+    assets: Iterable[str] = stations["Asset Name"].unique().tolist()
+
+    # turbine count per asset, parsed once instead of per asset
+    n_turb_dict = (
+        stations.drop_duplicates("Asset Name")
+                .set_index("Asset Name")["number_of_turbines"]
+                .to_dict()
+    )
 
-        zero_price_hrs = power.loc[power["pool_price"] == 0, "time"]
-        if not zero_price_hrs.empty:
-            print("\n⚠️  hours with zero price:")
-            print(zero_price_hrs.dt.strftime("%Y-%m-%d %H:%M").head(10).to_list(), "…")
-        else:
-            print("✓ no zero‑price hours")
 
-        print(f"  • merged rows: {len(power):5d}  (zero prices: {(power['pool_price'] == 0).sum():,})\n")
+    print("Assets found:")
+    for a in assets:
+        print(f" • {a}")
+    print()
 
-        summary = make_summary(power, CUTS, n_turbines)
-        print(summary, "\n")
+    # ── main loop ──────────────────────────────────────────────────────────
+    # every (asset, year) is independent: run them on all cores, print in order
+    tasks = [(a, y, n_turb_dict[a]) for a in assets for y in YEARS]
+    task_assets, task_years, task_turbines = zip(*tasks) if tasks else ((), (), ())
 
-        if SAVE_TABLE:
-            csv_out = f"summary_{asset}_{yr}_back_3.csv"
-            summary.to_csv(csv_out, index=False)
-            print(f"📄 table saved → {csv_out}")
+    with ProcessPoolExecutor() as ex:
+        results = ex.map(process_one, task_assets, task_years, task_turbines)
 
-        if SAVE_PLOT:
-            png_out = f"losses_vs_hours_{asset}_{yr}_back_3.png"
-            plot_summary(summary, asset, yr, CUTS, png_out)
+        current = None
+        for (asset, yr, n_turbines), log in zip(tasks, results):
+            if asset != current:
+                print(f"\n================ {asset}  –  {n_turbines} turbines ================")
+                current = asset
+            print(log, end="")
@@ -16,6 +16,7 @@ during peak summer months when wind patterns are most critical.
 
 import os
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib
 from matplotlib import pyplot as plt
@@ -41,10 +42,33 @@ MONTHS        = [7, 8, 9]                   # Analysis months: July, August, Sep
 MONTH_LABELS  = ["July", "August", "September"]  # Human-readable month names
 
 # ─── turbine meta ────────────────────────────────────────────────────
-meta         = pd.read_csv(STATIONS_CSV)
+meta         = pd.read_csv(STATIONS_CSV, usecols=["Asset Name", "number_of_turbines"], engine="pyarrow")
 TURBINES     = meta["Asset Name"].unique()
 N_TURB_DICT  = meta.set_index("Asset Name")["number_of_turbines"].to_dict()
 
+
+def month_values(times: pd.Series, values: pd.Series, scale: float):
+    """Month numbers and scaled values of the rows in MONTHS (NaN values skipped)."""
+    months = times.dt.month.to_numpy()
+    values = values.to_numpy(dtype=float) * scale
+    keep = np.isin(months, MONTHS) & ~np.isnan(values)
+    return months[keep].astype(np.intp), values[keep]
+
+
+def list_files(directory: Path) -> set:
+    """Names of the files in *directory* (empty if it does not exist)."""
+    return set(os.listdir(directory)) if directory.is_dir() else set()
+
+
+def is_old_column(name: str) -> bool:
+    """Columns read from the initial-estimate CSVs: power and time/date."""
+    return name == "power_out" or "time" in name.lower() or "date" in name.lower()
+
+# input file names, listed once instead of probed per turbine and year
+MOD_FILES  = list_files(DIR_OUT)
+REAL_FILES = list_files(DIR_REAL)
+OLD_FILES  = list_files(DIR_OLD)
+
 # ─── figure boiler-plate ─────────────────────────────────────────────
 fig, axes = plt.subplots(2, 2, figsize=(18, 12), sharey=True)
 axes      = axes.flatten()
@@ -54,43 +78,43 @@ FMT_CF = 1e9                                # kW → TW
 
 for idx, year in enumerate(YEARS):
 
-    # accumulator ➜ {month: {Series: MWh}}
-    monthly_tot = {m: {"AESO": 0.0, "Modelled": 0.0, "Initial": 0.0}
-                   for m in MONTHS}
+    # per-source (month, value) arrays of every turbine ➜ {Series: [(months, kW)]}
+    parts = {"AESO": [], "Modelled": [], "Initial": []}
 
     for turb in TURBINES:
         n_turb = N_TURB_DICT.get(turb, 1) or 1
 
         # modelled ----------------------------------------------------
-        f_mod = DIR_OUT / f"{turb}_{year}_power_output_new.csv"
-        if f_mod.exists():
-            df = (pd.read_csv(f_mod, parse_dates=["time"])
-                    .loc[lambda d: d["time"].dt.month.isin(MONTHS)])
-            df["power_out"] *= n_turb
-            for m, v in df.groupby(df["time"].dt.month)["power_out"].sum().items():
-                monthly_tot[m]["Modelled"] += v
+        f_mod = f"{turb}_{year}_power_output_new.parquet"
+        if f_mod in MOD_FILES:
+            df = pd.read_parquet(DIR_OUT / f_mod, columns=["time", "power_out"])
+            parts["Modelled"].append(month_values(df["time"], df["power_out"], n_turb))
 
         # AESO --------------------------------------------------------
-        f_real = DIR_REAL / f"{year}_{turb}.csv"
-        if f_real.exists():
-            df = (pd.read_csv(f_real, parse_dates=["Date (MST)"])
-                    .loc[lambda d: d["Date (MST)"].dt.month.isin(MONTHS)])
-            df["real_power"] = df["Volume"] * 1000        # MW → kW
-            for m, v in df.groupby(df["Date (MST)"].dt.month)["real_power"].sum().items():
-                monthly_tot[m]["AESO"] += v
+        f_real = f"{year}_{turb}.csv"
+        if f_real in REAL_FILES:
+            df = pd.read_csv(DIR_REAL / f_real, usecols=["Date (MST)", "Volume"],
+                             parse_dates=["Date (MST)"])
+            parts["AESO"].append(month_values(df["Date (MST)"], df["Volume"], 1000))  # MW → kW
 
         # initial -----------------------------------------------------
-        f_old = DIR_OLD / f"{turb}_{year}_power_output_new.csv"
-        if f_old.exists():
-            df = pd.read_csv(f_old)
+        f_old = f"{turb}_{year}_power_output_new.csv"
+        if f_old in OLD_FILES:
+            df = pd.read_csv(DIR_OLD / f_old, usecols=is_old_column)
             tcol = next((c for c in df.columns if "time" in c.lower()
                          or "date" in c.lower()), None)
             if tcol:
-                df[tcol] = pd.to_datetime(df[tcol], errors="coerce")
-                df = df.loc[df[tcol].dt.month.isin(MONTHS)]
-                df["power_out"] *= n_turb
-                for m, v in df.groupby(df[tcol].dt.month)["power_out"].sum().items():
-                    monthly_tot[m]["Initial"] += v
+                times = pd.to_datetime(df[tcol], errors="coerce")
+                parts["Initial"].append(month_values(times, df["power_out"], n_turb))
+
+    # one bincount per source ➜ {month: {Series: MWh}}
+    monthly_tot = {m: {} for m in MONTHS}
+    for source, arrays in parts.items():
+        months = np.concatenate([m for m, _ in arrays] or [np.empty(0, np.intp)])
+        values = np.concatenate([v for _, v in arrays] or [np.empty(0)])
+        totals = np.bincount(months, weights=values, minlength=max(MONTHS) + 1)
+        for m in MONTHS:
+            monthly_tot[m][source] = totals[m]
 
     # ----- DataFrame for this year ----------------------------------
     df_m = (pd.DataFrame.from_dict(monthly_tot, orient="index")
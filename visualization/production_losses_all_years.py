@@ -13,7 +13,9 @@ dir_base = "./supply/"                     # Base directory for supply data
 stations_path = os.path.join(dir_base, 'Nearby_base.csv')  # Path to wind turbine metadata
 
 # Load wind turbine metadata and remove duplicate entries
-wind_turbines = pd.read_csv(stations_path).drop_duplicates(subset=['Asset Name'])
+wind_turbines = pd.read_csv(
+    stations_path, usecols=['Asset Name', 'capacity_MW', 'number_of_turbines'], engine='pyarrow'
+).drop_duplicates(subset=['Asset Name'])
 
 # Calculate normalization factor for cost calculations (capacity × number of turbines)
 norm = wind_turbines['capacity_MW'].sum() * wind_turbines['number_of_turbines'].sum()
@@ -31,6 +33,9 @@ columns_no_normalization = [
     "Production smart, %"        # Production percentage for smart strategy
 ]
 
+# Columns read from the summary files
+summary_columns = {'Cut-in (m/s)', *columns_no_normalization, *columns_to_normalize}
+
 # Scenario names (only Scenario 1 and Scenario 3)
 selected_scenarios = {1: "Full Season", 3: "Peak Season"}
 
@@ -43,22 +48,24 @@ scenario_labels = []
 for i in selected_scenarios.keys():
     file_name = os.path.join(dir_data, f"summary_Alberta_{i}.csv")  # Ensure correct file path
     if os.path.exists(file_name):
-        df = pd.read_csv(file_name)  # Read CSV file
+        df = pd.read_csv(file_name, usecols=lambda c: c in summary_columns)  # Read CSV file (used columns only)
         print(f"Successfully loaded: {file_name}")
 
         # Store Cut-in speed values (Assumes all files have the same Cut-in column)
         if len(cut_in_values) == 0:  # Store only once
             cut_in_values = df['Cut-in (m/s)'].tolist()
 
-        # Store non-normalized data
-        for col in columns_no_normalization:
-            if col in df.columns:
-                data_dict[col].append(df[col])  # Store directly without normalization
+        # Store each column as a NumPy array (columns missing from the file are skipped)
+        raw_cols = [col for col in columns_no_normalization if col in df.columns]
+        cost_cols = [col for col in columns_to_normalize if col in df.columns]
+
+        # Non-normalized data, stored directly
+        for col, values in zip(raw_cols, df[raw_cols].to_numpy().T):
+            data_dict[col].append(values)
 
-        # Normalize specified columns (costs only) and store data
-        for col in columns_to_normalize:
-            if col in df.columns:
-                data_dict[col].append(df[col] / norm)  # Normalize and store
+        # Costs, normalized as one block
+        for col, values in zip(cost_cols, (df[cost_cols].to_numpy() / norm).T):
+            data_dict[col].append(values)
         
         scenario_labels.append(selected_scenarios[i])  # Use selected scenario names
     else:
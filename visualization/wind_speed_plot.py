@@ -18,6 +18,7 @@ import numpy as np
 import seaborn as sns
 import matplotlib
 import matplotlib.pyplot as plt
+from scipy.stats import gaussian_kde
 
 matplotlib.use("Agg")
 
@@ -37,6 +38,10 @@ BIN_EDGES  = np.arange(4, 13, 2)                        # Bin edges: 4, 6, 8, 10
 BIN_WIDTH  = np.diff(BIN_EDGES)[0]                       # Bin width (2 m/s)
 BIN_LABELS = [f"{a}-{b-1}" for a, b in zip(BIN_EDGES[:-1], BIN_EDGES[1:])]  # Labels: "4-5", "6-7", etc.
 
+# KDE curves: evaluation points per curve and multiplier on Scott's bandwidth
+KDE_GRIDSIZE  = 200
+KDE_BW_ADJUST = 0.8
+
 # colours & style
 SRC_ORDER   = ["Back-calc", "Modelled"]
 SRC_PALETTE = {"Back-calc": "#0173B2", "Modelled": "#DE8F05"}
@@ -44,43 +49,53 @@ sns.set_palette(list(SRC_PALETTE.values()))
 plt.rcParams.update({"font.size": 12})
 
 # ─── turbines ─────────────────────────────────────────────────────
-meta     = pd.read_csv(SUPPLY_DIR / "Nearby_base.csv")
+meta     = pd.read_csv(SUPPLY_DIR / "Nearby_base.csv", usecols=["Asset Name"], engine="pyarrow")
 TURBINES = meta["Asset Name"].unique()
 
 def read_series(path: Path, year: int):
     """Return DF[time,W_hub] filtered to 15 Jul–30 Sep, or None."""
     if not path.exists():
         return None
-    df = pd.read_csv(path, usecols=["time", "W_hub"])
-    df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    df = df.dropna(subset=["time", "W_hub"])
 
-    # --- keep only 15 Jul – 30 Sep ---
+    # --- keep only 15 Jul – 30 Sep (filtered while reading; null times never match) ---
     start = pd.Timestamp(year=year, month=7, day=15)
     end   = pd.Timestamp(year=year, month=9, day=30, hour=23, minute=59, second=59)
-    df = df[(df["time"] >= start) & (df["time"] <= end)]
+    df = pd.read_parquet(path, columns=["time", "W_hub"],
+                         filters=[("time", ">=", start), ("time", "<=", end)])
+
+    return df.dropna(subset=["W_hub"])
 
-    return df
+def kde_curve(x: np.ndarray):
+    """Return (grid, density) of a Gaussian KDE over the range of *x*, or None.
+
+    Same estimate seaborn's kdeplot draws with cut=0: Scott's bandwidth
+    scaled by KDE_BW_ADJUST, evaluated from min(x) to max(x).
+    """
+    if x.size < 2 or np.isclose(x.var(ddof=1), 0):
+        return None
+    kde  = gaussian_kde(x, bw_method=lambda k: k.scotts_factor() * KDE_BW_ADJUST)
+    grid = np.linspace(x.min(), x.max(), KDE_GRIDSIZE)
+    return grid, kde(grid)
 
 for turb in TURBINES:
     yearly = {}
 
     for yr in YEARS:
-        mod = read_series(MODEL_DIR / f"{turb}_{yr}_power_output_new.csv", yr)
-        bck = read_series(BACK_DIR  / f"{turb}_{yr}_power_backcalc.csv",   yr)
+        mod = read_series(MODEL_DIR / f"{turb}_{yr}_power_output_new.parquet", yr)
+        bck = read_series(BACK_DIR  / f"{turb}_{yr}_power_backcalc.parquet",   yr)
 
         if mod is None or bck is None or mod.empty or bck.empty:
             continue
 
         # restrict speed range 4-12 m s⁻¹
-        mod = mod.query("4 <= W_hub < 12")
-        bck = bck.query("4 <= W_hub < 12")
-        if mod.empty or bck.empty:
+        mod = mod["W_hub"].to_numpy()
+        bck = bck["W_hub"].to_numpy()
+        mod = mod[(mod >= 4) & (mod < 12)]
+        bck = bck[(bck >= 4) & (bck < 12)]
+        if mod.size == 0 or bck.size == 0:
             continue
 
-        mod["Source"] = "Modelled"
-        bck["Source"] = "Back-calc"
-        yearly[yr] = pd.concat([mod, bck])
+        yearly[yr] = {"Modelled": mod, "Back-calc": bck}
 
     if not yearly:
         continue
@@ -89,18 +104,23 @@ for turb in TURBINES:
     fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True, sharey=True)
     axes = axes.flatten()
 
-    for i, (ax, (yr, df)) in enumerate(zip(axes, sorted(yearly.items()))):
+    for i, (ax, (yr, speeds)) in enumerate(zip(axes, sorted(yearly.items()))):
 
 
-        # KDE overlay
-        sns.kdeplot(data=df, x="W_hub",
-                    hue="Source", hue_order=SRC_ORDER, palette=SRC_PALETTE,
-                    common_norm=False, bw_adjust=0.8, cut=0,
-                    fill=False, linewidth=1.4, ax=ax, legend=False)
+        # KDE overlay, one independently normalised curve per source
+        # (drawn last source first, so the first one ends up on top)
+        for src in reversed(SRC_ORDER):
+            curve = kde_curve(speeds[src])
+            if curve is None:
+                continue
+            line, = ax.plot(*curve, color=SRC_PALETTE[src], linewidth=1.4)
+            line.sticky_edges.y[:] = (0, np.inf)
 
         ax.set_title(str(yr))
         ax.set_xlim(4, 11)
-        ax.set_xlabel("Wind-speed (m/s)")
+        # x label only on panels that show x tick labels (outer row)
+        ax.set_xlabel("Wind-speed (m/s)",
+                      visible=any(t.get_visible() for t in ax.get_xticklabels()))
         ax.set_ylabel("Rel. freq." if i % 2 == 0 else "")
         ax.grid(alpha=.3)
 
@@ -2,17 +2,34 @@
 Data writing functions for wind turbine power correction application.
 """
 
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import os
 import logging
+import shutil
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(dir_out: str) -> Path:
+    """
+    Create *dir_out* (with parents) on first use and return it as a Path.
+    
+    Later calls for the same directory skip the mkdir syscalls; a directory
+    removed while the process runs is not re-created.
+    """
+    output_dir = Path(dir_out)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
 def write_power(speed_res_df: pd.DataFrame, dir_out: str, turbine_name: str, year: str) -> None:
     """
-    Write speed results DataFrame to CSV file.
+    Write speed results DataFrame to a Parquet file.
     
     Args:
         speed_res_df: DataFrame containing speed results
@@ -21,20 +38,18 @@ def write_power(speed_res_df: pd.DataFrame, dir_out: str, turbine_name: str, yea
         year: Year of data
     """
     try:
-        # Ensure output directory exists
-        output_dir = Path(dir_out)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Ensure output directory exists (created once per directory)
+        output_dir = _ensure_dir(os.fspath(dir_out))
         
         # Create filename
-        # filename = f"{turbine_name}_{year}_power_output_new_3.csv"
-        filename = f"{turbine_name}_{year}_power_output_new.csv"
+        # filename = f"{turbine_name}_{year}_power_output_new_3.parquet"
+        filename = f"{turbine_name}_{year}_power_output_new.parquet"
         file_path = output_dir / filename
         
-        # Write DataFrame to CSV
-        speed_res_df.to_csv(file_path, index=False)
+        # Write DataFrame to Parquet (columnar, compressed, keeps dtypes)
+        speed_res_df.to_parquet(file_path, engine='pyarrow', compression='zstd', index=False)
         
         logger.info(f"Successfully wrote speed results to: {file_path}")
-        print(f"Speed results written to: {file_path}")
         
     except Exception as e:
         logger.error(f"Error writing speed results for turbine {turbine_name}: {e}")
@@ -47,18 +62,36 @@ def write_backcalc(df: pd.DataFrame, dir_out: str,
                    turbine_name: str, year: str) -> None:
     """
     Writes the combined forward / backward-calc results.
-    Output file ends with _power_backcalc.csv
+    Output file ends with _power_backcalc.parquet
     """
     try:
-        output_dir = Path(dir_out)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = _ensure_dir(os.fspath(dir_out))
 
-        # fname = f"{turbine_name}_{year}_power_backcalc_3.csv"
-        fname = f"{turbine_name}_{year}_power_backcalc.csv"
-        df.to_csv(output_dir / fname, index=False)
+        # fname = f"{turbine_name}_{year}_power_backcalc_3.parquet"
+        fname = f"{turbine_name}_{year}_power_backcalc.parquet"
+        df.to_parquet(output_dir / fname, engine='pyarrow', compression='zstd', index=False)
         logger.info(f"Back-calc file written: {output_dir / fname}")
     except Exception as exc:
-        logger.error(f"Failed writing back-calc CSV: {exc}")
+        logger.error(f"Failed writing back-calc file: {exc}")
+        raise
+
+
+@functools.lru_cache(maxsize=None)
+def _io_pool() -> ThreadPoolExecutor:
+    """Writer thread pool, started on first use (so never inherited across fork)."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="write_data")
+
+
+def write_backcalc_async(df: pd.DataFrame, dir_out: str,
+                         turbine_name: str, year: str) -> Future:
+    """
+    Run `write_backcalc` in a background thread and return its Future.
+    
+    pyarrow releases the GIL while encoding and writing Parquet, so the
+    caller can prepare or write another file meanwhile. *df* must not be
+    modified until the Future is done.
+    """
+    return _io_pool().submit(write_backcalc, df, dir_out, turbine_name, year)
 
 
 def backup_file(file_path: str, backup_suffix: str = "_backup") -> str:
@@ -82,7 +115,6 @@ def backup_file(file_path: str, backup_suffix: str = "_backup") -> str:
         backup_path = path.with_suffix(f"{backup_suffix}{path.suffix}")
         
         # Copy file
-        import shutil
         shutil.copy2(path, backup_path)
         
         logger.info(f"Created backup: {backup_path}")
@@ -119,12 +151,24 @@ def validate_dataframe(df: pd.DataFrame, required_columns: list = None) -> bool:
                 logger.error(f"Missing required columns: {missing_columns}")
                 return False
         
+        # Float columns hold every inf and most NaNs: one np.isfinite pass
+        # over their values finds both, and only the non-finite entries are
+        # split into inf and NaN
+        floats = df.select_dtypes(include=[np.floating])
+        values = floats.to_numpy(dtype=float, na_value=np.nan)
+        non_finite = values[~np.isfinite(values)]
+        inf_count = np.count_nonzero(np.isinf(non_finite))
+        
         # Check for infinite values
-        if df.isin([float('inf'), float('-inf')]).any().any():
+        if inf_count > 0:
             logger.warning("DataFrame contains infinite values")
         
-        # Check for NaN values
-        nan_count = df.isna().sum().sum()
+        # Check for NaN values (missing entries of the other columns included;
+        # NumPy int and bool columns cannot hold any and are not scanned)
+        others = df.select_dtypes(exclude=[np.floating])
+        others = others.iloc[:, [not (isinstance(dt, np.dtype) and dt.kind in "biu")
+                                 for dt in others.dtypes]]
+        nan_count = non_finite.size - inf_count + np.count_nonzero(others.isna().to_numpy())
         if nan_count > 0:
             logger.warning(f"DataFrame contains {nan_count} NaN values")
         